@@ -0,0 +1,55 @@
+"""Compare the index registry with the live database.
+
+    python -m app.commands.indexes           # report missing and unused indexes
+    python -m app.commands.indexes --apply   # also create the missing ones
+"""
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.config.db_config import database, connect_to_mongo, close_mongo_connection
+from app.config.indexes import INDEXES, ensure_indexes
+import argparse
+import asyncio
+
+
+async def report(apply: bool):
+    await connect_to_mongo()
+    try:
+        return await _report(apply)
+    finally:
+        close_mongo_connection()
+
+
+async def _report(apply: bool):
+    problems = 0
+    for collection, models in INDEXES.items():
+        declared = {model.document["name"] for model in models}
+        existing = {index["name"] async for index in database[collection].list_indexes()}
+        for name in sorted(declared - existing):
+            print(f"MISSING  {collection}.{name}")
+            problems += 1
+
+        # $indexStats counts accesses since the last server restart
+        async for stats in database[collection].aggregate([{"$indexStats": {}}]):
+            if stats["name"] != "_id_" and stats["accesses"]["ops"] == 0:
+                print(f"UNUSED   {collection}.{stats['name']} (since {stats['accesses']['since']})")
+                problems += 1
+        for name in sorted(existing - declared - {"_id_"}):
+            print(f"EXTRA    {collection}.{name} (not in registry)")
+
+    if apply:
+        failures = await ensure_indexes(database)
+        for name, error in sorted(failures.items()):
+            print(f"FAILED   {name}: {error}")
+        problems = len(failures)
+        print("Missing indexes created." if not failures else f"{len(failures)} indexes could not be created.")
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report missing or unused MongoDB indexes")
+    parser.add_argument("--apply", action="store_true", help="create missing indexes")
+    args = parser.parse_args()
+    # With --apply only indexes that still failed to build count as problems
+    raise SystemExit(1 if asyncio.run(report(args.apply)) else 0)
@@ -0,0 +1,45 @@
+"""Convert every remaining {lat, lng} job location to a GeoJSON point.
+
+Jobs are also migrated lazily when read, but $geoNear only sees converted
+documents, so run this once after deploying:
+
+    python -m app.commands.migrate_locations
+"""
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.config.db_config import database, connect_to_mongo, close_mongo_connection
+from app.config.indexes import ensure_indexes
+from app.utils.geo import to_point
+from pymongo import UpdateOne
+import asyncio
+
+BATCH_SIZE = 500
+
+
+async def migrate():
+    await connect_to_mongo()
+    try:
+        jobs = database.get_collection("jobs")
+        legacy = {"location.lat": {"$exists": True}, "location.lng": {"$exists": True}}
+        operations = []
+        migrated = 0
+        async for job in jobs.find(legacy, {"location": 1}):
+            operations.append(UpdateOne(
+                {"_id": job["_id"], "location.lat": {"$exists": True}},
+                {"$set": {"location": to_point(job["location"])}}
+            ))
+            if len(operations) >= BATCH_SIZE:
+                migrated += (await jobs.bulk_write(operations, ordered=False)).modified_count
+                operations = []
+        if operations:
+            migrated += (await jobs.bulk_write(operations, ordered=False)).modified_count
+        print(f"Migrated {migrated} job locations.")
+        await ensure_indexes(database)
+    finally:
+        close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,53 @@
+"""Repair drift in the application_count kept on job documents.
+
+    python -m app.commands.reconcile_application_counts            # report only
+    python -m app.commands.reconcile_application_counts --apply    # fix counts
+
+Jobs written before the counter existed are counted on their first guarded
+write or application; --apply fills every one of them up front.
+"""
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.config.db_config import database, connect_to_mongo, close_mongo_connection
+from bson import ObjectId
+from pymongo import UpdateOne
+import argparse
+import asyncio
+
+
+async def reconcile(apply: bool):
+    await connect_to_mongo()
+    try:
+        jobs = database.get_collection("jobs")
+        applications = database.get_collection("job_applications")
+        actual = {}
+        async for row in applications.aggregate([{"$group": {"_id": "$job_id", "count": {"$sum": 1}}}]):
+            if ObjectId.is_valid(row["_id"]):
+                actual[ObjectId(row["_id"])] = row["count"]
+
+        operations = []
+        async for job in jobs.find({}, {"application_count": 1}):
+            expected = actual.get(job["_id"], 0)
+            stored = job.get("application_count")
+            if stored != expected:
+                print(f"{job['_id']}: stored={stored} actual={expected}")
+                operations.append(UpdateOne({"_id": job["_id"]}, {"$set": {"application_count": expected}}))
+
+        if operations and apply:
+            result = await jobs.bulk_write(operations, ordered=False)
+            print(f"Repaired {result.modified_count} jobs.")
+        else:
+            print(f"{len(operations)} jobs out of sync.")
+        return len(operations)
+    finally:
+        close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile job application counts")
+    parser.add_argument("--apply", action="store_true", help="write corrected counts")
+    args = parser.parse_args()
+    drifted = asyncio.run(reconcile(args.apply))
+    raise SystemExit(1 if drifted and not args.apply else 0)
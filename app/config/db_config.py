@@ -1,16 +1,128 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo.database import Database
+from pymongo import monitoring
+from collections import deque
 import os
 
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 DB_NAME = "fastapi_auth"
 
-client = AsyncIOMotorClient(MONGO_URI)
-try:
-    client.admin.command('ping')
-    print("MongoDB connection successful")
-except Exception as e:
-    print("MongoDB connection error:", e)
-    raise
+def _optional_int(name: str):
+    value = os.getenv(name)
+    return int(value) if value else None
 
-database: Database = client[DB_NAME]
+# Pools are per process, so size them per uvicorn worker
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = _optional_int("MONGO_MAX_IDLE_TIME_MS")
+MONGO_WAIT_QUEUE_TIMEOUT_MS = _optional_int("MONGO_WAIT_QUEUE_TIMEOUT_MS")
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    def __init__(self, samples: int = 1000):
+        self.open_connections = 0
+        self.in_use = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.wait_times_ms = deque(maxlen=samples)
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_check_out_started(self, event): pass
+
+    def connection_created(self, event):
+        self.open_connections += 1
+
+    def connection_closed(self, event):
+        self.open_connections -= 1
+
+    def connection_checked_out(self, event):
+        self.in_use += 1
+        self.checkouts += 1
+        self.wait_times_ms.append(event.duration * 1000)
+
+    def connection_check_out_failed(self, event):
+        self.checkout_failures += 1
+        self.wait_times_ms.append(event.duration * 1000)
+
+    def connection_checked_in(self, event):
+        self.in_use -= 1
+
+    def stats(self) -> dict:
+        waits = sorted(self.wait_times_ms)
+        return {
+            "max_pool_size": MONGO_MAX_POOL_SIZE,
+            "min_pool_size": MONGO_MIN_POOL_SIZE,
+            "open_connections": self.open_connections,
+            "in_use": self.in_use,
+            "checkouts": self.checkouts,
+            "checkout_failures": self.checkout_failures,
+            "checkout_wait_ms": {
+                "avg": sum(waits) / len(waits) if waits else 0.0,
+                "p95": waits[int(len(waits) * 0.95) - 1] if waits else 0.0,
+                "max": waits[-1] if waits else 0.0,
+            },
+        }
+
+
+pool_monitor = PoolMonitor()
+client = None
+_collections = {}
+
+async def connect_to_mongo():
+    global client
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "event_listeners": [pool_monitor],
+    }
+    if MONGO_MAX_IDLE_TIME_MS is not None:
+        options["maxIdleTimeMS"] = MONGO_MAX_IDLE_TIME_MS
+    if MONGO_WAIT_QUEUE_TIMEOUT_MS is not None:
+        options["waitQueueTimeoutMS"] = MONGO_WAIT_QUEUE_TIMEOUT_MS
+    client = AsyncIOMotorClient(MONGO_URI, **options)
+    _collections.clear()
+    try:
+        await client.admin.command('ping')
+        print("MongoDB connection successful")
+    except Exception as e:
+        print("MongoDB connection error:", e)
+        raise
+
+def close_mongo_connection():
+    global client
+    if client is not None:
+        client.close()
+        client = None
+    _collections.clear()
+
+def get_database():
+    if client is None:
+        raise RuntimeError("MongoDB client is not connected; call connect_to_mongo() first")
+    return client[DB_NAME]
+
+
+class LazyCollection:
+    """Module-level collection handle that resolves against the current client."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __getattr__(self, attr):
+        collection = _collections.get(self.name)
+        if collection is None:
+            collection = _collections[self.name] = get_database()[self.name]
+        return getattr(collection, attr)
+
+
+class _Database:
+    def get_collection(self, name: str) -> LazyCollection:
+        return LazyCollection(name)
+
+    def __getitem__(self, name: str) -> LazyCollection:
+        return LazyCollection(name)
+
+
+database = _Database()
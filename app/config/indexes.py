@@ -0,0 +1,114 @@
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT, GEOSPHERE
+from pymongo.errors import OperationFailure
+from app.utils.jwt_util import ACCESS_TOKEN_EXPIRE_MINUTES
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+# Refuse to start without every index instead of serving degraded
+REQUIRE_INDEXES = os.getenv("REQUIRE_INDEXES", "false").lower() == "true"
+FAILED_EMAIL_RETENTION_DAYS = int(os.getenv("FAILED_EMAIL_RETENTION_DAYS", "7"))
+
+# Every index the services rely on, by collection. Names are fixed so the
+# registry can be diffed against what the server actually has.
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+    ],
+    "jobs": [
+        # Keyset pagination of the listing: equality on status, then the sort keys
+        IndexModel(
+            [("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="status_created_at_id"
+        ),
+        IndexModel([("created_by", ASCENDING)], name="created_by"),
+        # Page query of /jobs/filter: equality on the selected facets, then the
+        # listing sort keys. The facet counts only use status_amount.
+        IndexModel(
+            [("status", ASCENDING), ("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="status_category_created_at_id"
+        ),
+        IndexModel(
+            [("status", ASCENDING), ("workplace_type", ASCENDING), ("job_type", ASCENDING),
+             ("experience_level", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="status_workplace_job_type_level_created_at_id"
+        ),
+        IndexModel([("status", ASCENDING), ("amount", ASCENDING)], name="status_amount"),
+        # Legacy {lat, lng} locations can block this build; run
+        # python -m app.commands.migrate_locations first on older data
+        IndexModel([("location", GEOSPHERE), ("status", ASCENDING)], name="location_2dsphere"),
+        # A collection can only have one text index; weights rank title hits highest
+        IndexModel(
+            [("title", TEXT), ("skills_required", TEXT), ("overview", TEXT), ("description", TEXT)],
+            weights={"title": 10, "skills_required": 5, "overview": 3, "description": 1},
+            name="job_text"
+        ),
+    ],
+    "job_applications": [
+        IndexModel([("job_id", ASCENDING), ("user_id", ASCENDING)], unique=True, name="job_user_unique"),
+        # Keyset-paginated listings for job owners and for applicants
+        IndexModel(
+            [("job_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="job_created_at_id"
+        ),
+        IndexModel(
+            [("job_id", ASCENDING), ("proposed_amount", ASCENDING), ("_id", ASCENDING)],
+            name="job_amount_id"
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_created_at_id"
+        ),
+    ],
+    "favorites": [
+        IndexModel([("user_id", ASCENDING), ("job_id", ASCENDING)], unique=True, name="user_job_unique"),
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_created_at_id"
+        ),
+    ],
+    "job_reports": [
+        IndexModel([("status", ASCENDING)], name="status"),
+        IndexModel([("job_id", ASCENDING)], name="job_id"),
+        IndexModel([("reporter_id", ASCENDING)], name="reporter_id"),
+    ],
+    "email_outbox": [
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)], name="status_next_attempt"),
+        # Only rows marked failed carry failed_at
+        IndexModel(
+            [("failed_at", ASCENDING)],
+            expireAfterSeconds=FAILED_EMAIL_RETENTION_DAYS * 86400,
+            name="failed_at_ttl"
+        ),
+    ],
+    "password_reset_otps": [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+    ],
+    "token_revocations": [
+        # Entries only matter while a token issued before them can still be valid
+        IndexModel(
+            [("revoked_at", ASCENDING)],
+            expireAfterSeconds=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            name="revoked_at_ttl"
+        ),
+    ],
+}
+
+# "collection.index" -> error for every index the last ensure_indexes() could not build
+index_failures = {}
+
+async def ensure_indexes(database) -> dict:
+    # One spec per call: a single bad index (duplicates under a unique key,
+    # legacy locations under the 2dsphere) must not stop the rest being built
+    failures = {}
+    for collection, models in INDEXES.items():
+        for model in models:
+            name = f"{collection}.{model.document['name']}"
+            try:
+                await database[collection].create_indexes([model])
+            except OperationFailure as e:
+                logger.error(f"Could not create index {name}: {e}")
+                failures[name] = str(e)
+    index_failures.clear()
+    index_failures.update(failures)
+    return failures
@@ -1,10 +1,21 @@
 from fastapi import HTTPException, status, Request
-from app.services import auth_service, user_service
+from app.services import auth_service, user_service, otp_service
 from app.models.user_model import PasswordChange
 from app.services.auth_service import verify_password
-from app.utils.jwt_util import create_jwt_token
+from app.utils.jwt_util import create_jwt_token, user_claims, STATELESS_AUTH
 from app.services.user_service import get_user_by_email
-from datetime import datetime
+from app.utils.rate_limit import TokenBucketLimiter
+import secrets
+import os
+
+LOGIN_WINDOW_SECONDS = float(os.getenv("LOGIN_WINDOW_SECONDS", "60"))
+LOGIN_LIMITER_MAX_KEYS = int(os.getenv("LOGIN_LIMITER_MAX_KEYS", "100000"))
+ip_login_limiter = TokenBucketLimiter(
+    int(os.getenv("LOGIN_MAX_ATTEMPTS_PER_IP", "20")), LOGIN_WINDOW_SECONDS, LOGIN_LIMITER_MAX_KEYS
+)
+email_login_limiter = TokenBucketLimiter(
+    int(os.getenv("LOGIN_MAX_ATTEMPTS_PER_EMAIL", "5")), LOGIN_WINDOW_SECONDS, LOGIN_LIMITER_MAX_KEYS
+)
 
 async def register_user(first_name: str, last_name: str, email: str, password: str):
     existing_user = await get_user_by_email(email)
@@ -24,7 +35,26 @@ async def register_user(first_name: str, last_name: str, email: str, password: s
     )
     return {"user": user}
 
-async def login_user(email: str, password: str):
+def throttle_login(email: str, client_ip: str = None):
+    # Runs before the user lookup so rejected attempts never reach bcrypt
+    buckets = [(limiter, key) for limiter, key in
+               ((ip_login_limiter, client_ip), (email_login_limiter, email.lower())) if key]
+    # Check every bucket first so a rejected attempt drains none of them
+    for limiter, key in buckets:
+        if not limiter.allow(key, consume=False):
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts. Please try again later.",
+                headers={"Retry-After": str(limiter.retry_after())}
+            )
+    for limiter, key in buckets:
+        limiter.allow(key)
+
+def login_throttle_stats():
+    return {"ip": ip_login_limiter.stats(), "email": email_login_limiter.stats()}
+
+async def login_user(email: str, password: str, client_ip: str = None):
+    throttle_login(email, client_ip)
     user = await get_user_by_email(email)
 
     if not user or not user.get("active", True):
@@ -33,7 +63,8 @@ async def login_user(email: str, password: str):
     if not await verify_password(password, user["password"]):
         return None
 
-    token = create_jwt_token(user["_id"], user["email"])
+    claims = user_claims(user) if STATELESS_AUTH else None
+    token = create_jwt_token(user["_id"], user["email"], claims)
     return {
         "user": user,
         "access_token": token,
@@ -52,46 +83,25 @@ async def forgot_password_request(email: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-async def verify_otp(otp: str):
-    user = await user_service.get_user_by_otp(otp)
-    if not user or datetime.utcnow() > user.get("otp_expiry"):
+async def verify_otp(email: str, otp: str):
+    reset_token = secrets.token_urlsafe(32)
+    if not await otp_service.verify_otp(email, otp, reset_token):
         raise HTTPException(status_code=400, detail="Invalid or expired OTP")
-    
-    await user_service.update_user(
-        user["_id"],
-        {"otp_verified": True}
-    )
-    return {"message": "OTP verified successfully"}
+    return {"message": "OTP verified successfully", "reset_token": reset_token}
 
-async def reset_password(new_password: str, confirm_password: str):
+async def reset_password(email: str, reset_token: str, new_password: str, confirm_password: str):
     if new_password != confirm_password:
         raise HTTPException(status_code=400, detail="Passwords don't match")
 
-    user = await user_service.get_user_by_otp_verified()
+    if not await otp_service.consume_reset_token(email, reset_token):
+        raise HTTPException(status_code=403, detail="Invalid or expired reset token. Please request a new OTP.")
+
+    user = await user_service.get_user_by_email(email)
     if not user:
-        raise HTTPException(status_code=403, detail="OTP not verified")
-
-    if datetime.utcnow() > user.get("otp_expiry", datetime.utcnow()):
-        await user_service.update_user(
-            user["_id"],
-            {
-                "otp_verified": False,
-                "otp": None,
-                "otp_expiry": None
-            }
-        )
-        raise HTTPException(status_code=403, detail="OTP verification expired. Please request a new OTP.")
-
-    hashed_password = auth_service.pwd_context.hash(new_password)
-    await user_service.update_user(
-        user["_id"],
-        {
-            "password": hashed_password,
-            "otp_verified": False,
-            "otp": None,
-            "otp_expiry": None
-        }
-    )
+        raise HTTPException(status_code=404, detail="User not found")
+
+    hashed_password = await auth_service.hash_password(new_password)
+    await user_service.update_user(user["_id"], {"password": hashed_password})
     return {"message": "Password updated successfully"}
 async def change_password(request: Request):
     user = request.state.user
@@ -105,9 +115,9 @@ async def change_password(request: Request):
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not auth_service.pwd_context.verify(password_data.current_password, db_user["password"]):
+    if not await auth_service.verify_password(password_data.current_password, db_user["password"]):
         raise HTTPException(status_code=403, detail="Incorrect current password")
 
-    hashed_pw = auth_service.pwd_context.hash(password_data.new_password)
-    await auth_service.update_user(str(user["_id"]), {"password": hashed_pw})
+    hashed_pw = await auth_service.hash_password(password_data.new_password)
+    await user_service.update_user(str(user["_id"]), {"password": hashed_pw})
     return {"message": "Password changed successfully"}
@@ -1,8 +1,22 @@
-from fastapi import HTTPException
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
 from app.services import job_service
 from app.validations import job_validations
 from app.validations.admin_validations import is_admin
-from app.services import job_seeker_service
+from app.services import job_seeker_service, event_service
+from app.utils.pagination import DEFAULT_PAGE_SIZE
+from app.utils.streaming import ndjson_response
+from app.utils.cache import TTLCache
+from app.utils.http_cache import conditional_response, resource_etag, body_etag
+from app.utils.serialization import dumps
+import asyncio
+import os
+
+# The TTL bounds staleness from writes handled by other worker processes
+LISTING_CACHE_TTL_SECONDS = float(os.getenv("LISTING_CACHE_TTL_SECONDS", "10"))
+LISTING_CACHE_MAX_SIZE = int(os.getenv("LISTING_CACHE_MAX_SIZE", "256"))
+listing_cache = TTLCache(max_size=LISTING_CACHE_MAX_SIZE, ttl=LISTING_CACHE_TTL_SECONDS)
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
 
 async def post_job(job_data: dict, user_id: str):
     try:
@@ -11,6 +25,65 @@ async def post_job(job_data: dict, user_id: str):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+MAX_BULK_JOBS = 100
+MAX_BULK_APPLICATIONS = 100
+
+def _error_detail(error: Exception) -> str:
+    return error.detail if isinstance(error, HTTPException) else str(error)
+
+async def post_jobs_bulk(items: list, user_id: str):
+    if not isinstance(items, list) or not items:
+        raise HTTPException(status_code=400, detail="Request body must be a non-empty list of jobs")
+    if len(items) > MAX_BULK_JOBS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_JOBS} jobs can be posted at once")
+
+    results = []
+    documents = []
+    for index, item in enumerate(items):
+        try:
+            job_validations.validate_job_data(item)
+            document = job_service.build_job_document(item, user_id)
+        except Exception as e:
+            results.append({"index": index, "status": "invalid", "error": _error_detail(e)})
+            continue
+        documents.append(document)
+        results.append({"index": index, "status": "created", "job": document})
+
+    failed = await job_service.create_jobs(documents) if documents else {}
+    created = [result for result in results if result["status"] == "created"]
+    for position, result in enumerate(created):
+        if position in failed:
+            result.update(status="failed", error=failed[position])
+            del result["job"]
+        else:
+            result["job"] = job_service.serialize_job(result["job"])
+    return {"results": results}
+
+async def set_jobs_status_bulk(job_ids: list, status: str, admin_id: str):
+    if not await is_admin(admin_id):
+        raise HTTPException(status_code=403, detail="Only admins can change job status")
+    if status not in ("active", "blocked"):
+        raise HTTPException(status_code=400, detail="status must be 'active' or 'blocked'")
+    if not isinstance(job_ids, list) or not job_ids:
+        raise HTTPException(status_code=400, detail="job_ids must be a non-empty list")
+    if len(job_ids) > MAX_BULK_JOBS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_JOBS} jobs can be updated at once")
+
+    valid_ids = [job_id for job_id in job_ids if job_validations.validate_object_id(job_id)]
+    previous = await job_service.set_jobs_status(valid_ids, status) if valid_ids else {}
+    results = []
+    for job_id in job_ids:
+        if not job_validations.validate_object_id(job_id):
+            outcome = "invalid_id"
+        elif job_id not in previous:
+            outcome = "not_found"
+        elif previous[job_id] == status:
+            outcome = "unchanged"
+        else:
+            outcome = "updated"
+        results.append({"job_id": job_id, "status": outcome})
+    return {"results": results}
+
 async def update_user_job(job_id: str, update_data: dict, user_id: str):
     if not job_validations.validate_object_id(job_id):
         raise HTTPException(status_code=400, detail="Invalid job ID format")
@@ -21,15 +94,17 @@ async def update_user_job(job_id: str, update_data: dict, user_id: str):
     
     job_validations.validate_job_ownership(job, user_id)
     
-    if await job_seeker_service.get_application_count(job_id) > 0:
-        raise HTTPException(status_code=400, detail="Cannot update job that has applications")
-    
+    if update_data.get("location") is not None:
+        job_validations.validate_location(update_data["location"])
     if update_data:
         job_validations.validate_job_data({
             k: v for k, v in update_data.items() if k in job_validations.required_fields
         })
     
-    return await job_service.update_job(job_id, update_data)
+    updated = await job_service.update_job(job_id, update_data, owner_id=user_id)
+    if not updated:
+        raise HTTPException(status_code=400, detail="Cannot update job that has applications")
+    return updated
 
 async def delete_user_job(job_id: str, user_id: str):
     if not job_validations.validate_object_id(job_id):
@@ -39,13 +114,9 @@ async def delete_user_job(job_id: str, user_id: str):
         raise HTTPException(status_code=404, detail="Job not found")
     job_validations.validate_job_ownership(job, user_id)
     
-    if await job_seeker_service.get_application_count(job_id) > 0:
-        raise HTTPException(status_code=400, detail="Cannot delete job that has applications"
-        )
-    
-    result = await job_service.delete_job(job_id)
+    result = await job_service.delete_job(job_id, owner_id=user_id)
     if not result.get("deleted"):
-        raise HTTPException(status_code=500, detail="Failed to delete job")
+        raise HTTPException(status_code=400, detail="Cannot delete job that has applications")
     return {"message": "Job deleted successfully"}
 
 async def get_job(job_id: str, user_id: str = None):
@@ -56,14 +127,70 @@ async def get_job(job_id: str, user_id: str = None):
         raise HTTPException(status_code=404, detail="Job not found")
     return job
 
-async def get_all_jobs(user_id: str = None):
-    return await job_service.get_all_jobs(user_id)
+async def get_job_response(request: Request, job_id: str, user_id: str = None):
+    job = await get_job(job_id, user_id)
+    return conditional_response(
+        request, job, resource_etag(job["id"], job["revision"]), job["updated_at"]
+    )
+
+async def get_all_jobs_response(request: Request, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+    generation = job_service.jobs_generation
+    key = (generation, limit, cursor)
+    cached = listing_cache.get(key)
+    if cached is None:
+        result = await job_service.get_all_jobs(None, limit, cursor)
+        body = dumps(result)
+        cached = (body, body_etag(body))
+        listing_cache.set(key, cached)
+    body, etag = cached
+    return conditional_response(request, body, etag)
+
+async def search_jobs(text: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+    return await job_service.search_jobs(text, limit, cursor)
+
+async def filter_jobs(filters: dict, min_amount: float = None, max_amount: float = None,
+                      limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+    if min_amount is not None and max_amount is not None and min_amount > max_amount:
+        raise HTTPException(status_code=400, detail="Minimum amount cannot be greater than maximum amount")
+    return await job_service.filter_jobs(filters, min_amount, max_amount, limit, cursor)
+
+async def get_nearby_jobs(lat: float, lng: float, radius_km: float,
+                          workplace_type: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    job_validations.validate_location({"lat": lat, "lng": lng})
+    return await job_service.get_nearby_jobs(lat, lng, radius_km, workplace_type, limit)
+
+def stream_events(request: Request, user_id: str):
+    async def events():
+        queue = event_service.subscribe(user_id)
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment lines keep proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                yield event_service.format_sse(event)
+        finally:
+            event_service.unsubscribe(user_id, queue)
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def export_all_jobs(admin_id: str):
+    if not await is_admin(admin_id):
+        raise HTTPException(status_code=403, detail="Only admins can export all jobs")
+    return ndjson_response(job_service.iter_all_jobs())
 
 async def get_user_jobs(user_id: str):
     # Show all jobs (including blocked) to owner
     return await job_service.get_jobs_by_user(user_id)
 
-async def get_job_applications(job_id: str, user_id: str):
+async def get_job_applications(job_id: str, user_id: str, sort: str = "newest",
+                               limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
     if not job_validations.validate_object_id(job_id):
         raise HTTPException(status_code=400, detail="Invalid job ID format")
     
@@ -73,7 +200,49 @@ async def get_job_applications(job_id: str, user_id: str):
     
     job_validations.validate_job_ownership(job, user_id)
     
-    return await job_seeker_service.get_applications_for_job(job_id)
+    return await job_seeker_service.get_applications_for_job(job_id, sort, limit, cursor)
+
+async def set_applications_status(job_id: str, user_id: str, application_ids: list,
+                                  status: str, from_statuses: list = None):
+    if not job_validations.validate_object_id(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID format")
+    allowed = job_seeker_service.APPLICATION_TRANSITIONS.get(status)
+    if not allowed:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid status. Must be one of: {', '.join(job_seeker_service.APPLICATION_TRANSITIONS)}"
+        )
+    if isinstance(from_statuses, str):
+        from_statuses = [from_statuses]
+    if from_statuses:
+        # Callers may narrow the transition, e.g. only move rows still pending
+        allowed = [state for state in allowed if state in from_statuses]
+    if not isinstance(application_ids, list) or not application_ids:
+        raise HTTPException(status_code=400, detail="application_ids must be a non-empty list")
+    if len(application_ids) > MAX_BULK_APPLICATIONS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_BULK_APPLICATIONS} applications can be updated at once"
+        )
+
+    job = await job_service.get_job_by_id(job_id, user_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job_validations.validate_job_ownership(job, user_id)
+
+    valid_ids = [app_id for app_id in application_ids if job_validations.validate_object_id(app_id)]
+    outcomes = {}
+    if valid_ids:
+        # Even with no allowed transition the service still tells existing
+        # applications (invalid_transition) apart from missing ones (not_found)
+        outcomes = await job_seeker_service.set_applications_status(job_id, valid_ids, status, allowed)
+    results = []
+    for app_id in application_ids:
+        if not job_validations.validate_object_id(app_id):
+            outcome = "invalid_id"
+        else:
+            outcome = outcomes.get(app_id, "not_found")
+        results.append({"application_id": app_id, "status": outcome})
+    return {"results": results}
 
 async def block_job(job_id: str, admin_id: str):
     if not job_validations.validate_object_id(job_id):
@@ -1,28 +1,62 @@
 from fastapi import HTTPException
-from app.services import job_service, job_seeker_service
+from pymongo.errors import DuplicateKeyError
+from bson import ObjectId
+from app.services import job_service, job_seeker_service, event_service
 from app.validations.admin_validations import is_admin
+from app.utils.streaming import ndjson_response
+from app.utils.pagination import DEFAULT_PAGE_SIZE
+
+def _application_event(app: dict) -> dict:
+    return {
+        "application_id": str(app.get("_id", app.get("id"))),
+        "job_id": app["job_id"],
+        "user_id": app["user_id"],
+        "proposed_amount": app.get("proposed_amount"),
+        "status": app.get("status"),
+    }
+
+async def _publish_to_job_owner(job_id: str, event_type: str, data: dict):
+    job = await job_service.get_job_by_id(job_id, admin_check=True)
+    if job:
+        event_service.publish(job["created_by"], event_type, data)
+
 async def apply_for_job(job_id: str, user_id: str, data: dict):
     job = await job_service.get_job_by_id(job_id)
     if not job:
         raise HTTPException(404, "Job not found")
     
-    user_apps = await job_seeker_service.get_user_applications(user_id)
-    if any(app["job_id"] == job_id for app in user_apps):
+    # The unique (job_id, user_id) index makes the insert itself the duplicate check
+    try:
+        application = await job_seeker_service.apply_for_job(job_id, user_id, data)
+    except DuplicateKeyError:
         raise HTTPException(400, "You have already applied for this job")
+    event_service.publish(job["created_by"], "application.created", _application_event(application))
+    return application
 
-    return await job_seeker_service.apply_for_job(job_id, user_id, data)
-
-async def get_job_applications(job_id: str, user_id: str):
+async def get_job_applications(job_id: str, user_id: str, sort: str = "newest",
+                               limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
     job = await job_service.get_job_by_id(job_id)
     if not job:
         raise HTTPException(404, "Job not found")
     if job["created_by"] != user_id:
         raise HTTPException(403, "You can only view applications for your own jobs")
     
-    return await job_seeker_service.get_applications_for_job(job_id)
+    return await job_seeker_service.get_applications_for_job(job_id, sort, limit, cursor)
 
-async def get_user_applications(user_id: str):
-    return await job_seeker_service.get_user_applications(user_id)
+async def get_user_applications(user_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+    return await job_seeker_service.get_user_applications(user_id, limit, cursor)
+
+async def get_application(application_id: str, user_id: str):
+    if not ObjectId.is_valid(application_id):
+        raise HTTPException(400, "Invalid application ID format")
+    app = await job_seeker_service.get_application_by_id(application_id)
+    if not app:
+        raise HTTPException(404, "Application not found")
+    if app["user_id"] != user_id:
+        job = await job_service.get_job_by_id(app["job_id"], user_id)
+        if not job or job["created_by"] != user_id:
+            raise HTTPException(403, "You can only view your own applications or applications to your jobs")
+    return app
 
 async def update_proposal(application_id: str, user_id: str, data: dict):
     app = await job_seeker_service.get_application_by_id(application_id)
@@ -31,7 +65,10 @@ async def update_proposal(application_id: str, user_id: str, data: dict):
     if app["user_id"] != user_id:
         raise HTTPException(403, "You can only update your own proposals")
     
-    return await job_seeker_service.update_proposal(application_id, data)
+    updated = await job_seeker_service.update_proposal(application_id, data)
+    if updated:
+        await _publish_to_job_owner(app["job_id"], "application.updated", _application_event(updated))
+    return updated
 
 async def delete_proposal(application_id: str, user_id: str):
     app = await job_seeker_service.get_application_by_id(application_id)
@@ -40,18 +77,20 @@ async def delete_proposal(application_id: str, user_id: str):
     if app["user_id"] != user_id:
         raise HTTPException(403, "You can only delete your own proposals")
 
-    return await job_seeker_service.delete_proposal(application_id)
+    result = await job_seeker_service.delete_proposal(application_id)
+    await _publish_to_job_owner(app["job_id"], "application.deleted", _application_event(app))
+    return result
 
 async def add_job_to_favorites(job_id: str, user_id: str):
     job = await job_service.get_job_by_id(job_id)
     if not job:
         raise HTTPException(404, "Job not found")
 
-    if await job_seeker_service.is_job_favorited(job_id, user_id):
+    try:
+        return await job_seeker_service.add_job_to_favorites(job_id, user_id)
+    except DuplicateKeyError:
         raise HTTPException(400, "Job already in favorites")
 
-    return await job_seeker_service.add_job_to_favorites(job_id, user_id)
-
 async def remove_job_from_favorites(job_id: str, user_id: str):
     job = await job_service.get_job_by_id(job_id)
     if not job:
@@ -63,8 +102,8 @@ async def remove_job_from_favorites(job_id: str, user_id: str):
 
     return await job_seeker_service.remove_job_from_favorites(job_id, user_id)
 
-async def get_user_favorites(user_id: str):
-    return await job_seeker_service.get_user_favorites(user_id)
+async def get_user_favorites(user_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+    return await job_seeker_service.get_user_favorites(user_id, limit, cursor)
 
 
 async def report_job(job_id: str, reporter_id: str, reason: str):
@@ -72,7 +111,13 @@ async def report_job(job_id: str, reporter_id: str, reason: str):
     if not job:
         raise HTTPException(404, "Job not found")
     
-    return await job_seeker_service.create_job_report(job_id, reporter_id, reason)
+    report = await job_seeker_service.create_job_report(job_id, reporter_id, reason)
+    event_service.publish(job["created_by"], "report.created", {
+        "report_id": report["id"],
+        "job_id": job_id,
+        "reason": reason,
+    })
+    return report
 
 async def get_job_reports(job_id: str, user_id: str):
     job = await job_service.get_job_by_id(job_id)
@@ -96,5 +141,12 @@ async def resolve_report(report_id: str, admin_id: str, notes: str):
     # Update report status and add admin notes
     return await job_seeker_service.resolve_report(report_id, notes)
 
-async def get_pending_reports():
+async def get_pending_reports(admin_id: str):
+    if not await is_admin(admin_id):
+        raise HTTPException(403, "Only admins can view reports")
     return await job_seeker_service.get_pending_reports()
+
+async def export_pending_reports(admin_id: str):
+    if not await is_admin(admin_id):
+        raise HTTPException(403, "Only admins can view reports")
+    return ndjson_response(job_seeker_service.iter_pending_reports())
@@ -2,6 +2,8 @@ from fastapi import HTTPException, Request
 from app.services import user_service
 from app.models import user_model 
 from app.validations.admin_validations import is_admin
+from app.utils.streaming import ndjson_response
+from app.utils.http_cache import conditional_response, resource_etag
 
 async def create_user(request: Request):
     is_admin(request.state.user)
@@ -17,9 +19,11 @@ async def create_user(request: Request):
 
     return await user_service.create_user(**user.dict())
 
-async def get_all_users(request: Request):
+async def get_all_users(request: Request, format: str = "json"):
     if not await is_admin(request.state.user["_id"]):
         raise HTTPException(status_code=403, detail="Only admins can view all users")
+    if format == "ndjson":
+        return ndjson_response(user_service.iter_all_users())
     return await user_service.get_all_users()
 
 async def delete_user(user_id: str, request: Request):
@@ -32,6 +36,17 @@ async def deactivate_user(user_id: str, request: Request):
         raise HTTPException(status_code=403, detail="Only admins can deactivate users")
     return await user_service.deactivate_user(user_id)
 
+async def get_profile(request: Request):
+    user = request.state.user
+    if getattr(request.state, "claims_only", False):
+        # Claims tokens only carry authorization fields
+        user = await user_service.get_cached_user(user["_id"], user["email"])
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+    return conditional_response(
+        request, user, resource_etag(user["_id"], user.get("revision", 0)), user.get("updated_at")
+    )
+
 async def get_user_by_email(email: str):
     user = await user_service.get_user_by_email(email)
     if not user:
@@ -1,7 +1,8 @@
 from fastapi import Request
 from fastapi.responses import JSONResponse
-from app.utils.jwt_util import decode_jwt
-from app.services import user_service
+from app.utils.jwt_util import decode_jwt, request_claims, STATELESS_AUTH
+from app.services import user_service, revocation_service
+from app.utils import identity_map
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,8 @@ async def auth_middleware(request: Request, call_next):
         "/docs",
         "/redoc",
         "/openapi.json",
+        "/health/live",
+        "/health/ready",
         "/"
     ]:
         return await call_next(request)
@@ -55,19 +58,43 @@ async def auth_middleware(request: Request, call_next):
                 content={"detail": "Invalid token payload"}
             )
         
-        email = payload.get("email")
-        if email:
-            user = await user_service.get_user_by_email(email)
+        if STATELESS_AUTH and "ver" in payload:
+            await revocation_service.refresh_if_stale()
+            if revocation_service.is_revoked(user_id, payload["ver"]):
+                return JSONResponse(
+                    status_code=401,
+                    content={"detail": "Token has been revoked"}
+                )
+            if payload.get("is_blocked") or not payload.get("active", True):
+                return JSONResponse(
+                    status_code=403,
+                    content={"detail": "User is blocked or inactive"}
+                )
+            request.state.user = {
+                "_id": user_id,
+                "email": payload.get("email"),
+                "role": payload.get("role"),
+                "active": payload.get("active"),
+                "is_blocked": payload.get("is_blocked"),
+                "token_version": payload["ver"],
+            }
+            request.state.claims_only = True
+            request_claims.set(payload)
         else:
-            user = None
-            
-        if not user:
-            return JSONResponse(
-                status_code=401,
-                content={"detail": "User not found"}
-            )
-        
-        request.state.user = user
+            email = payload.get("email")
+            if email:
+                user = await user_service.get_cached_user(user_id, email)
+            else:
+                user = None
+
+            if not user:
+                return JSONResponse(
+                    status_code=401,
+                    content={"detail": "User not found"}
+                )
+
+            request.state.user = user
+            identity_map.remember("users", user["_id"], user)
         
     except Exception as e:
         logger.error(f"Authentication error: {str(e)}")
@@ -0,0 +1,21 @@
+from fastapi import Request
+from app.utils import identity_map
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+# Off by default: the header exposes internals on every response
+IDENTITY_MAP_DEBUG_HEADER = os.getenv("IDENTITY_MAP_DEBUG_HEADER", "false").lower() == "true"
+
+async def identity_map_middleware(request: Request, call_next):
+    token = identity_map.begin()
+    try:
+        response = await call_next(request)
+        unit = identity_map.current()
+        if IDENTITY_MAP_DEBUG_HEADER:
+            response.headers["X-DB-Reads-Saved"] = str(unit.saved)
+        if unit.saved:
+            logger.debug(f"{request.method} {request.url.path}: {unit.loads} reads, {unit.saved} saved")
+        return response
+    finally:
+        identity_map.end(token)
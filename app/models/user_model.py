@@ -79,6 +79,9 @@ def user_helper(user) -> dict:
         "_id": str(user["_id"]),
         **{k: user.get(k) for k in UserBase.__fields__.keys() if k not in ["otp", "otp_expiry", "otp_verified", "is_blocked", "password"]},
         "password": user.get("password"),
-        "is_blocked": user.get("is_blocked", False) 
+        "is_blocked": user.get("is_blocked", False),
+        "token_version": user.get("token_version", 0),
+        "revision": user.get("revision", 0),
+        "updated_at": user.get("updated_at")
     }
     
\ No newline at end of file
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Query
 from app.controllers import job_seeker_controller
 from app.services.job_seeker_service import get_user_id
 from app.controllers import job_controller
-from fastapi.encoders import jsonable_encoder
+from app.utils.serialization import BSONJSONResponse
 
 router = APIRouter()
 
@@ -14,12 +14,24 @@ async def resolve_report(report_id: str, request: Request):
         get_user_id(request),
         body["notes"]
     )
-    return jsonable_encoder(result)
+    return BSONJSONResponse(result)
 
 @router.get("/reports/pending")
-async def get_pending_reports(request: Request):
-    result = await job_seeker_controller.get_pending_reports()
-    return jsonable_encoder(result)
+async def get_pending_reports(request: Request, format: str = Query("json", pattern="^(json|ndjson)$")):
+    if format == "ndjson":
+        return await job_seeker_controller.export_pending_reports(get_user_id(request))
+    result = await job_seeker_controller.get_pending_reports(get_user_id(request))
+    return BSONJSONResponse(result)
+
+@router.put("/jobs/block")
+async def set_jobs_status(request: Request):
+    body = await request.json()
+    result = await job_controller.set_jobs_status_bulk(
+        body.get("job_ids"),
+        body.get("status", "blocked"),
+        str(request.state.user["_id"])
+    )
+    return BSONJSONResponse(result)
 
 @router.put("/jobs/{job_id}/block")
 async def block_job(job_id: str, request: Request):
@@ -27,7 +39,7 @@ async def block_job(job_id: str, request: Request):
         job_id,
         str(request.state.user["_id"])
     )
-    return jsonable_encoder(result)
+    return BSONJSONResponse(result)
 
 @router.put("/jobs/{job_id}/unblock")
 async def unblock_job(job_id: str, request: Request):
@@ -35,4 +47,4 @@ async def unblock_job(job_id: str, request: Request):
         job_id,
         str(request.state.user["_id"])
     )
-    return jsonable_encoder(result)
\ No newline at end of file
+    return BSONJSONResponse(result)
\ No newline at end of file
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException, Body ,Request
+from fastapi import APIRouter, HTTPException, Request
 from app.validations import auth_validations
 from app.controllers import auth_controller
+from app.utils.rate_limit import client_ip
 
 from fastapi import APIRouter, Depends
 from fastapi.security import HTTPBearer
@@ -16,8 +17,8 @@ async def register(payload: auth_validations.UserRegister):
     return user
 
 @router.post("/login")
-async def login(payload: auth_validations.UserLogin):
-    user = await auth_controller.login_user(**payload.dict())
+async def login(payload: auth_validations.UserLogin, request: Request):
+    user = await auth_controller.login_user(**payload.dict(), client_ip=client_ip(request))
     if not user:
         raise HTTPException(status_code=400, detail="Invalid credentials")
     return user
@@ -33,12 +34,14 @@ async def forgot_password(payload: auth_validations.ForgotPasswordRequest):
 
 
 @router.post("/verify-otp")
-async def verify_otp_route(otp: str = Body(..., embed=True)):
-    return await auth_controller.verify_otp(otp)
+async def verify_otp_route(payload: auth_validations.VerifyOtpRequest):
+    return await auth_controller.verify_otp(payload.email, payload.otp)
 
 @router.post("/reset-password")
 async def reset_password(payload: auth_validations.ResetPasswordRequest):
     return await auth_controller.reset_password(
+        payload.email,
+        payload.reset_token,
         payload.new_password,
         payload.confirm_password
     )
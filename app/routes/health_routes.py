@@ -0,0 +1,46 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse
+from app.config import db_config, indexes
+from app.controllers import auth_controller, job_controller
+from app.services import job_service, user_service, event_service
+from app.utils import password_util
+from app.validations.admin_validations import is_admin
+import time
+
+router = APIRouter()
+
+@router.get("/live")
+async def live():
+    return {"status": "ok"}
+
+@router.get("/ready")
+async def ready():
+    start = time.perf_counter()
+    try:
+        await db_config.get_database().command("ping")
+    except Exception as e:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "detail": str(e), "pool": db_config.pool_monitor.stats()}
+        )
+    return {
+        "status": "degraded" if indexes.index_failures else "ok",
+        "ping_ms": (time.perf_counter() - start) * 1000,
+        "pool": db_config.pool_monitor.stats(),
+        "index_failures": sorted(indexes.index_failures),
+    }
+
+@router.get("/metrics")
+async def metrics(request: Request):
+    if not await is_admin(request.state.user["_id"]):
+        raise HTTPException(status_code=403, detail="Only admins can view metrics")
+    return {
+        "pool": db_config.pool_monitor.stats(),
+        "user_cache": user_service.user_cache.stats(),
+        "job_cache": job_service.job_cache_stats(),
+        "listing_cache": job_controller.listing_cache.stats(),
+        "password_hashing": password_util.stats(),
+        "login_throttle": auth_controller.login_throttle_stats(),
+        "events": event_service.stats(),
+        "index_failures": indexes.index_failures,
+    }
@@ -1,37 +1,119 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Query
+from app.utils.serialization import BSONJSONResponse
+from typing import Optional
 from app.controllers import job_controller
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter()
 
 @router.post("/")
 async def create_job(request: Request):
     body = await request.json()
-    return await job_controller.post_job(body, request.state.user["_id"])
+    return BSONJSONResponse(await job_controller.post_job(body, request.state.user["_id"]))
+
+@router.post("/bulk")
+async def create_jobs_bulk(request: Request):
+    body = await request.json()
+    return BSONJSONResponse(await job_controller.post_jobs_bulk(body, request.state.user["_id"]))
 
 @router.get("/all")
-async def get_all_jobs():
-    return await job_controller.get_all_jobs()
+async def get_all_jobs(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$")
+):
+    if format == "ndjson":
+        return await job_controller.export_all_jobs(str(request.state.user["_id"]))
+    return await job_controller.get_all_jobs_response(request, limit=limit, cursor=cursor)
+
+@router.get("/events")
+async def job_events(request: Request):
+    return job_controller.stream_events(request, str(request.state.user["_id"]))
+
+@router.get("/search")
+async def search_jobs(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    return BSONJSONResponse(await job_controller.search_jobs(q, limit=limit, cursor=cursor))
+
+@router.get("/filter")
+async def filter_jobs(
+    category: Optional[str] = Query(None, max_length=50),
+    workplace_type: Optional[str] = Query(None, pattern="^(remote|onsite|hybrid)$"),
+    job_type: Optional[str] = Query(None, pattern="^(full-time|part-time|contract|freelance)$"),
+    experience_level: Optional[str] = Query(None, pattern="^(entry level|intermediate|expert)$"),
+    rate_type: Optional[str] = Query(None, pattern="^(hourly|daily|weekly|monthly)$"),
+    min_amount: Optional[float] = Query(None, ge=0),
+    max_amount: Optional[float] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    filters = {
+        "category": category,
+        "workplace_type": workplace_type,
+        "job_type": job_type,
+        "experience_level": experience_level,
+        "rate_type": rate_type,
+    }
+    return BSONJSONResponse(
+        await job_controller.filter_jobs(filters, min_amount, max_amount, limit=limit, cursor=cursor)
+    )
+
+@router.get("/nearby")
+async def get_nearby_jobs(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(25, gt=0, le=500),
+    workplace_type: Optional[str] = Query(None, pattern="^(onsite|hybrid)$"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    return BSONJSONResponse(await job_controller.get_nearby_jobs(lat, lng, radius_km, workplace_type, limit))
 
 @router.get("/{job_id}")
-async def get_job(job_id: str):
-    return await job_controller.get_job(job_id)
+async def get_job(job_id: str, request: Request):
+    return await job_controller.get_job_response(request, job_id)
 
 @router.get("/")
 async def get_user_jobs(request: Request):
-    return await job_controller.get_user_jobs(request.state.user["_id"])
+    return BSONJSONResponse(await job_controller.get_user_jobs(request.state.user["_id"]))
 
 @router.put("/{job_id}")
 async def update_job(job_id: str, request: Request):
     body = await request.json()
-    return await job_controller.update_user_job(job_id, body, request.state.user["_id"])
+    return BSONJSONResponse(await job_controller.update_user_job(job_id, body, request.state.user["_id"]))
 
 @router.delete("/{job_id}")
 async def delete_job(job_id: str, request: Request):
-    return await job_controller.delete_user_job(job_id, request.state.user["_id"])
+    return BSONJSONResponse(await job_controller.delete_user_job(job_id, request.state.user["_id"]))
 
 @router.get("/{job_id}/applications")
-async def get_job_applications(job_id: str, request: Request):
-    return await job_controller.get_job_applications(
+async def get_job_applications(
+    job_id: str,
+    request: Request,
+    sort: str = Query("newest", pattern="^(newest|amount_asc|amount_desc)$"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    result = await job_controller.get_job_applications(
+        job_id,
+        request.state.user["_id"],
+        sort,
+        limit,
+        cursor
+    )
+    return BSONJSONResponse(result)
+
+@router.put("/{job_id}/applications/status")
+async def set_applications_status(job_id: str, request: Request):
+    body = await request.json()
+    result = await job_controller.set_applications_status(
         job_id,
-        request.state.user["_id"]
+        request.state.user["_id"],
+        body.get("application_ids"),
+        body.get("status"),
+        body.get("from_status")
     )
+    return BSONJSONResponse(result)
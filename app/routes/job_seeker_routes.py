@@ -1,29 +1,48 @@
-from fastapi import APIRouter, Request
-from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, Request, Query
+from app.utils.serialization import BSONJSONResponse
+from typing import Optional
 from app.controllers import job_seeker_controller
-from app.services.job_seeker_service import get_user_id, serialize_doc
+from app.services.job_seeker_service import get_user_id
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 router = APIRouter()
 
 @router.post("/apply/{job_id}")
 async def apply_for_job(job_id: str, request: Request):
     body = await request.json()
     result = await job_seeker_controller.apply_for_job(job_id, get_user_id(request), body)
-    return jsonable_encoder(serialize_doc(result))
+    return BSONJSONResponse(result)
 
 @router.get("/proposals/{job_id}")
-async def get_job_applications(job_id: str, request: Request):
-    result = await job_seeker_controller.get_job_applications(job_id, get_user_id(request))
-    return jsonable_encoder([serialize_doc(app) for app in result])
+async def get_job_applications(
+    job_id: str,
+    request: Request,
+    sort: str = Query("newest", pattern="^(newest|amount_asc|amount_desc)$"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    result = await job_seeker_controller.get_job_applications(
+        job_id, get_user_id(request), sort, limit, cursor
+    )
+    return BSONJSONResponse(result)
 
 @router.get("/my-proposals")
-async def get_user_applications(request: Request):
-    result = await job_seeker_controller.get_user_applications(get_user_id(request))
-    return jsonable_encoder([serialize_doc(app) for app in result])
+async def get_user_applications(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    result = await job_seeker_controller.get_user_applications(get_user_id(request), limit, cursor)
+    return BSONJSONResponse(result)
+
+@router.get("/applications/{application_id}")
+async def get_application(application_id: str, request: Request):
+    result = await job_seeker_controller.get_application(application_id, get_user_id(request))
+    return BSONJSONResponse(result)
 
 @router.post("/favorites/{job_id}")
 async def add_favorite_job(job_id: str, request: Request):
     result = await job_seeker_controller.add_job_to_favorites(job_id, get_user_id(request))
-    return jsonable_encoder(serialize_doc(result))
+    return BSONJSONResponse(result)
 
 @router.delete("/favorites/{job_id}")
 async def remove_favorite_job(job_id: str, request: Request):
@@ -31,15 +50,19 @@ async def remove_favorite_job(job_id: str, request: Request):
     return {"message": "Job removed from favorites"}
 
 @router.get("/favorites")
-async def get_favorite_jobs(request: Request):
-    result = await job_seeker_controller.get_user_favorites(get_user_id(request))
-    return jsonable_encoder([serialize_doc(job) for job in result])
+async def get_favorite_jobs(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    result = await job_seeker_controller.get_user_favorites(get_user_id(request), limit, cursor)
+    return BSONJSONResponse(result)
 
 @router.put("/proposals/{application_id}")
 async def update_proposal(application_id: str, request: Request):
     body = await request.json()
     result = await job_seeker_controller.update_proposal(application_id, get_user_id(request), body)
-    return jsonable_encoder(serialize_doc(result))
+    return BSONJSONResponse(result)
 
 @router.delete("/proposals/{application_id}")
 async def delete_proposal(application_id: str, request: Request):
@@ -55,7 +78,7 @@ async def report_job(job_id: str, request: Request):
         get_user_id(request),
         body["reason"]
     )
-    return jsonable_encoder(result)
+    return BSONJSONResponse(result)
 
 @router.get("/reports/{job_id}")
 async def get_job_reports(job_id: str, request: Request):
@@ -63,9 +86,9 @@ async def get_job_reports(job_id: str, request: Request):
         job_id,
         get_user_id(request)
     )
-    return jsonable_encoder(result)
+    return BSONJSONResponse(result)
 
 @router.get("/my-reports")
 async def get_my_reports(request: Request):
     result = await job_seeker_controller.get_my_reports(get_user_id(request))
-    return jsonable_encoder(result)
+    return BSONJSONResponse(result)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Query
 from app.controllers import user_controller
 
 router = APIRouter()
@@ -8,8 +8,8 @@ async def create_user(request: Request):
     return await user_controller.create_user(request)
 
 @router.get("/")
-async def get_all_users(request: Request):
-    return await user_controller.get_all_users(request)
+async def get_all_users(request: Request, format: str = Query("json", pattern="^(json|ndjson)$")):
+    return await user_controller.get_all_users(request, format)
 
 @router.put("/{user_id}")
 async def update_user(user_id: str, request: Request):
@@ -29,4 +29,4 @@ async def deactivate_user(user_id: str, request: Request):
 
 @router.get("/profile")
 async def get_current_user_profile(request: Request):
-    return request.state.user
+    return await user_controller.get_profile(request)
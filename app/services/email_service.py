@@ -0,0 +1,195 @@
+from app.config.db_config import database
+from email.mime.text import MIMEText
+from email.utils import formataddr
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+import asyncio
+import logging
+import smtplib
+import threading
+import os
+
+logger = logging.getLogger(__name__)
+outbox = database.get_collection("email_outbox")
+
+SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+# Disable for plain local relays such as an aiosmtpd stand-in
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+EMAIL_FROM = os.getenv("EMAIL_FROM", "noreply@gmail.com")
+EMAIL_FROM_NAME = os.getenv("EMAIL_FROM_NAME", "Tradala")
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "5"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "6"))
+OUTBOX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_BACKOFF_SECONDS", "10"))
+OUTBOX_LEASE_SECONDS = float(os.getenv("OUTBOX_LEASE_SECONDS", "120"))
+
+_wakeup = asyncio.Event()
+_worker = None
+_smtp = None
+# Held by whichever thread is using the SMTP session, so shutdown's quit()
+# waits for an in-flight send instead of closing the socket under it
+_smtp_lock = threading.RLock()
+
+async def enqueue_email(to: str, subject: str, body: str):
+    now = datetime.utcnow()
+    await outbox.insert_one({
+        "to": to,
+        "subject": subject,
+        "body": body,
+        "status": "pending",
+        "attempts": 0,
+        "next_attempt_at": now,
+        "created_at": now
+    })
+    _wakeup.set()
+
+def _connect():
+    server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=10)
+    server.ehlo()
+    if SMTP_STARTTLS:
+        server.starttls()
+        server.ehlo()
+    if SMTP_USERNAME:
+        server.login(SMTP_USERNAME, (SMTP_PASSWORD or "").strip())
+    return server
+
+def _ensure_connection():
+    global _smtp
+    with _smtp_lock:
+        if _smtp is not None:
+            try:
+                if _smtp.noop()[0] == 250:
+                    return _smtp
+            except smtplib.SMTPException:
+                pass
+            _close_connection()
+        _smtp = _connect()
+        return _smtp
+
+def _close_connection():
+    global _smtp
+    with _smtp_lock:
+        if _smtp is not None:
+            try:
+                _smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            _smtp = None
+
+def _send(message: dict):
+    msg = MIMEText(message["body"])
+    msg['Subject'] = message["subject"]
+    msg['From'] = formataddr((EMAIL_FROM_NAME, EMAIL_FROM))
+    msg['To'] = message["to"]
+    with _smtp_lock:
+        try:
+            (_smtp or _ensure_connection()).send_message(msg)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            # The session dropped between messages; reconnect once and retry
+            _close_connection()
+            _ensure_connection().send_message(msg)
+
+def _failed_update(error: str) -> dict:
+    # The body can hold an OTP; keep only the envelope for diagnosis and
+    # let the failed_at TTL index remove the row
+    return {"$set": {"status": "failed", "last_error": error, "failed_at": datetime.utcnow()},
+            "$unset": {"body": ""}}
+
+async def _claim_batch() -> list:
+    now = datetime.utcnow()
+    # A lease that keeps expiring means the message crashes or hangs the
+    # worker; once its claims use up the attempts, stop handing it out
+    await outbox.update_many(
+        {"status": "sending", "locked_until": {"$lte": now}, "attempts": {"$gte": OUTBOX_MAX_ATTEMPTS}},
+        _failed_update("lease expired without a result")
+    )
+    due = {"$or": [
+        {"status": "pending", "next_attempt_at": {"$lte": now}},
+        {"status": "sending", "locked_until": {"$lte": now}}
+    ]}
+    batch = []
+    # Claimed one at a time so several workers never send the same message
+    for _ in range(OUTBOX_BATCH_SIZE):
+        message = await outbox.find_one_and_update(
+            due,
+            {"$set": {"status": "sending", "locked_until": now + timedelta(seconds=OUTBOX_LEASE_SECONDS)},
+             "$inc": {"attempts": 1}},
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+        if not message:
+            break
+        batch.append(message)
+    return batch
+
+async def _record_failure(message: dict, error: Exception):
+    # Counted when the message was claimed
+    attempts = message["attempts"]
+    if attempts >= OUTBOX_MAX_ATTEMPTS:
+        update = _failed_update(str(error))
+    else:
+        delay = OUTBOX_BACKOFF_SECONDS * (2 ** (attempts - 1))
+        update = {"$set": {
+            "status": "pending",
+            "last_error": str(error),
+            "next_attempt_at": datetime.utcnow() + timedelta(seconds=delay)
+        }}
+    await outbox.update_one({"_id": message["_id"]}, update)
+    logger.warning(f"Email to {message['to']} failed (attempt {attempts}): {error}")
+
+async def deliver_pending() -> int:
+    batch = await _claim_batch()
+    if not batch:
+        return 0
+    try:
+        await asyncio.to_thread(_ensure_connection)
+    except Exception as e:
+        for message in batch:
+            await _record_failure(message, e)
+        return 0
+    sent = 0
+    for message in batch:
+        try:
+            await asyncio.to_thread(_send, message)
+        except Exception as e:
+            await _record_failure(message, e)
+            continue
+        await outbox.delete_one({"_id": message["_id"]})
+        sent += 1
+    return sent
+
+async def _run_worker():
+    while True:
+        try:
+            sent = await deliver_pending()
+        except Exception as e:
+            logger.error(f"Email outbox error: {e}")
+            sent = 0
+        if sent:
+            continue
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=OUTBOX_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+
+def start_worker():
+    global _worker
+    if _worker is None:
+        _worker = asyncio.create_task(_run_worker())
+
+async def stop_worker():
+    global _worker
+    if _worker is not None:
+        _worker.cancel()
+        try:
+            await _worker
+        except asyncio.CancelledError:
+            pass
+        _worker = None
+    # Blocks on _smtp_lock until a send still running in its thread returns
+    await asyncio.to_thread(_close_connection)
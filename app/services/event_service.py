@@ -0,0 +1,52 @@
+from app.utils.serialization import dumps
+from collections import defaultdict
+from datetime import datetime
+import asyncio
+import itertools
+import os
+
+# Events are delivered only to subscribers connected to this worker process
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("SUBSCRIBER_QUEUE_SIZE", "100"))
+
+_subscribers = defaultdict(set)
+_event_ids = itertools.count(1)
+dropped = 0
+
+def subscribe(user_id: str) -> asyncio.Queue:
+    queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+    _subscribers[user_id].add(queue)
+    return queue
+
+def unsubscribe(user_id: str, queue: asyncio.Queue):
+    queues = _subscribers.get(user_id)
+    if queues is not None:
+        queues.discard(queue)
+        if not queues:
+            del _subscribers[user_id]
+
+def publish(user_id: str, event_type: str, data: dict):
+    global dropped
+    queues = _subscribers.get(str(user_id))
+    if not queues:
+        return
+    event = {
+        "id": next(_event_ids),
+        "type": event_type,
+        "data": dumps({**data, "occurred_at": datetime.utcnow()}).decode(),
+    }
+    for queue in queues:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A stalled client must not block publishers or grow memory
+            dropped += 1
+
+def format_sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {event['data']}\n\n"
+
+def stats() -> dict:
+    return {
+        "subscribed_users": len(_subscribers),
+        "connections": sum(len(queues) for queues in _subscribers.values()),
+        "dropped_events": dropped,
+    }
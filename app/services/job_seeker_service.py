@@ -4,19 +4,38 @@ from app.config.db_config import database
 from bson import ObjectId
 from datetime import datetime
 from app.services import job_service
+from app.utils.streaming import EXPORT_BATCH_SIZE
+from app.utils import identity_map
+from app.utils.pagination import fetch_page, cursor_filter, split_page, DEFAULT_PAGE_SIZE
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
 
 job_applications = database.get_collection("job_applications")
 favorites_collection = database.get_collection("favorites")
 reports_collection = database.get_collection("job_reports")
 
+FAVORITES_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+APPLICATION_SORTS = {
+    "newest": [("created_at", DESCENDING), ("_id", DESCENDING)],
+    "amount_asc": [("proposed_amount", ASCENDING), ("_id", ASCENDING)],
+    "amount_desc": [("proposed_amount", DESCENDING), ("_id", DESCENDING)],
+}
+# Target status -> statuses an application may move from
+APPLICATION_TRANSITIONS = {
+    "shortlisted": ["pending"],
+    "accepted": ["pending", "shortlisted"],
+    "rejected": ["pending", "shortlisted"],
+}
+# Listings leave out the cover letter; it is loaded when one application is opened
+APPLICATION_SUMMARY = {"cover_letter": 0}
+
 def get_user_id(request: Request) -> str:
     return str(request.state.user["_id"])
 
 def serialize_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
-    doc = doc.copy()
-    doc["id"] = str(doc.pop("_id", doc.get("id", "")))
-    if isinstance(doc.get("created_by"), ObjectId):
-        doc["created_by"] = str(doc["created_by"])
+    # Documents are freshly loaded from Mongo and owned by the caller, so they
+    # are renamed in place; ObjectId values are left to the response encoder.
+    if "_id" in doc:
+        doc["id"] = str(doc.pop("_id"))
     return doc
 
 async def apply_for_job(job_id: str, user_id: str, data: dict):
@@ -31,19 +50,67 @@ async def apply_for_job(job_id: str, user_id: str, data: dict):
     }
     res = await job_applications.insert_one(application)
     application["_id"] = res.inserted_id
-    return application
+    await job_service.increment_application_count(job_id, 1)
+    return serialize_doc(application)
+
+async def get_applications_for_job(job_id: str, sort: str = "newest",
+                                   limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+    applications, next_cursor = await fetch_page(
+        job_applications, {"job_id": job_id}, APPLICATION_SORTS[sort], limit, cursor,
+        projection=APPLICATION_SUMMARY, nullable=("proposed_amount",)
+    )
+    return {"applications": [serialize_doc(app) for app in applications], "next_cursor": next_cursor}
+
+async def get_user_applications(user_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+    apps, next_cursor = await fetch_page(
+        job_applications, {"user_id": user_id}, APPLICATION_SORTS["newest"], limit, cursor,
+        projection=APPLICATION_SUMMARY
+    )
+    return {"applications": [serialize_doc(app) for app in apps], "next_cursor": next_cursor}
 
-async def get_applications_for_job(job_id: str):
-    applications = await job_applications.find({"job_id": job_id}).to_list(None)
-    return [serialize_doc(app) for app in applications]
+async def set_applications_status(job_id: str, application_ids: list, status: str, from_statuses: list):
+    """Move many applications of one job to ``status`` with a single bulk_write.
 
-async def get_user_applications(user_id: str):
-    apps = await job_applications.find({"user_id": user_id}).to_list(None)
-    return [serialize_doc(app) for app in apps]
+    Returns application_id -> outcome for every id that belongs to the job.
+    """
+    object_ids = [ObjectId(application_id) for application_id in application_ids]
+    current = {
+        str(app["_id"]): app["status"]
+        async for app in job_applications.find({"_id": {"$in": object_ids}, "job_id": job_id}, {"status": 1})
+    }
+    eligible = [application_id for application_id, state in current.items() if state in from_statuses]
+    outcomes = {application_id: "invalid_transition" for application_id in current}
+    if not eligible:
+        return outcomes
+
+    now = datetime.utcnow()
+    # The status condition in each filter keeps a concurrent change from being overwritten
+    result = await job_applications.bulk_write([
+        UpdateOne(
+            {"_id": ObjectId(application_id), "job_id": job_id, "status": {"$in": from_statuses}},
+            {"$set": {"status": status, "updated_at": now}}
+        )
+        for application_id in eligible
+    ], ordered=False)
+    for application_id in eligible:
+        outcomes[application_id] = "updated"
+        identity_map.forget("job_applications", application_id)
+    if result.modified_count < len(eligible):
+        # Some rows moved between the read and the write; find out which
+        async for app in job_applications.find(
+            {"_id": {"$in": [ObjectId(application_id) for application_id in eligible]}},
+            {"status": 1}
+        ):
+            if app["status"] != status:
+                outcomes[str(app["_id"])] = "conflict"
+    return outcomes
 
 async def get_application_by_id(application_id: str):
-    doc = await job_applications.find_one({"_id": ObjectId(application_id)})
-    return serialize_doc(doc) if doc else None
+    async def fetch():
+        doc = await job_applications.find_one({"_id": ObjectId(application_id)})
+        return serialize_doc(doc) if doc else None
+    app = await identity_map.load("job_applications", application_id, fetch)
+    return dict(app) if app else None
 
 async def update_proposal(application_id: str, data: dict):
     await job_applications.update_one(
@@ -54,13 +121,17 @@ async def update_proposal(application_id: str, data: dict):
             "updated_at": datetime.utcnow()
         }}
     )
+    identity_map.forget("job_applications", application_id)
     return await get_application_by_id(application_id)
 
 async def delete_proposal(application_id: str):
-    await job_applications.delete_one({"_id": ObjectId(application_id)})
-
-async def get_application_count(job_id: str):
-    return await job_applications.count_documents({"job_id": job_id})
+    deleted = await job_applications.find_one_and_delete(
+        {"_id": ObjectId(application_id)},
+        projection={"job_id": 1}
+    )
+    identity_map.forget("job_applications", application_id)
+    if deleted:
+        await job_service.increment_application_count(deleted["job_id"], -1)
 
 async def add_job_to_favorites(job_id: str, user_id: str):
     favorite = {
@@ -75,21 +146,32 @@ async def add_job_to_favorites(job_id: str, user_id: str):
 async def remove_job_from_favorites(job_id: str, user_id: str):
     await favorites_collection.delete_one({"job_id": job_id, "user_id": user_id})
 
-async def get_user_favorites(user_id: str):
-    favorites = await favorites_collection.find({"user_id": user_id}).to_list(None)
-    jobs = []
-    for fav in favorites:
-        job = await job_service.get_job_by_id(fav["job_id"])
-        if job:
-            jobs.append({
-                **job,
-                "favorite_id": str(fav["_id"]),
-                "favorited_at": fav["created_at"]
-            })
-    return jobs
-
-async def is_job_favorited(job_id: str, user_id: str):
-    return await favorites_collection.count_documents({"job_id": job_id, "user_id": user_id}) > 0
+async def get_user_favorites(user_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+    pipeline = [{"$match": {"user_id": user_id}}]
+    if cursor:
+        pipeline.append({"$match": cursor_filter(FAVORITES_SORT, cursor)})
+    pipeline += [
+        {"$sort": dict(FAVORITES_SORT)},
+        {"$lookup": {
+            "from": "jobs",
+            "let": {"job_id": {"$toObjectId": "$job_id"}},
+            "pipeline": [{"$match": {"$expr": {"$eq": ["$_id", "$$job_id"]}, "status": {"$ne": "blocked"}}}],
+            "as": "job"
+        }},
+        {"$unwind": "$job"},
+        {"$limit": limit + 1}
+    ]
+    favorites = await favorites_collection.aggregate(pipeline).to_list(limit + 1)
+    page, next_cursor = split_page(favorites, FAVORITES_SORT, limit)
+    jobs = [
+        {
+            **job_service.serialize_job(fav["job"]),
+            "favorite_id": str(fav["_id"]),
+            "favorited_at": fav["created_at"]
+        }
+        for fav in page
+    ]
+    return {"jobs": jobs, "next_cursor": next_cursor}
 
 async def get_favorite_by_job_and_user(job_id: str, user_id: str):
     return await favorites_collection.find_one({"job_id": job_id, "user_id": user_id})
@@ -116,16 +198,22 @@ async def get_user_reports(user_id: str):
     return [serialize_doc(report) for report in reports]
 
 async def resolve_report(report_id: str, notes: str):
-    await reports_collection.update_one(
+    report = await reports_collection.find_one_and_update(
         {"_id": ObjectId(report_id)},
         {"$set": {
             "status": "resolved",
             "admin_notes": notes,
             "resolved_at": datetime.utcnow()
-        }}
+        }},
+        return_document=ReturnDocument.AFTER
     )
-    return await reports_collection.find_one({"_id": ObjectId(report_id)})
+    return serialize_doc(report) if report else None
 
 async def get_pending_reports():
     reports = await reports_collection.find({"status": "pending"}).to_list(None)
     return [serialize_doc(report) for report in reports]
+
+
+async def iter_pending_reports():
+    async for report in reports_collection.find({"status": "pending"}).batch_size(EXPORT_BATCH_SIZE):
+        yield serialize_doc(report)
@@ -1,13 +1,34 @@
 from app.config.db_config import database
 from app.models import job_model
 from bson import ObjectId
-from app.services import job_seeker_service
 from app.validations.admin_validations import is_admin
+from app.utils.pagination import fetch_page, cursor_filter, split_page, DEFAULT_PAGE_SIZE
+from app.utils.streaming import EXPORT_BATCH_SIZE
+from app.utils.geo import to_point, from_point, is_legacy_location
+from app.utils.cache import TTLCache, SingleFlight
+from app.utils import identity_map
+from pymongo import DESCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 from datetime import datetime
+import asyncio
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 jobs = database.get_collection("jobs")
+job_applications = database.get_collection("job_applications")
+
+JOB_CACHE_TTL_SECONDS = float(os.getenv("JOB_CACHE_TTL_SECONDS", "30"))
+JOB_CACHE_MAX_SIZE = int(os.getenv("JOB_CACHE_MAX_SIZE", "5000"))
+job_cache = TTLCache(max_size=JOB_CACHE_MAX_SIZE, ttl=JOB_CACHE_TTL_SECONDS)
+job_loads = SingleFlight()
+# Bumped on every job write; anything rendered under an older value is stale
+jobs_generation = 0
+
+# Newest first; _id breaks ties between jobs created in the same millisecond
+LISTING_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+SEARCH_SORT = [("score", DESCENDING), ("_id", DESCENDING)]
+FACET_FIELDS = ["category", "workplace_type", "job_type", "experience_level", "rate_type"]
 
 def serialize_job(job) -> dict:
     return {
@@ -20,7 +41,7 @@ def serialize_job(job) -> dict:
         "status": job["status"],
         "category": job.get("category"),
         "workplace_type": job.get("workplace_type"),
-        "location": job.get("location"),
+        "location": from_point(job.get("location")),
         "deadline": job.get("deadline"),
         "min_amount": job.get("min_amount"),
         "max_amount": job.get("max_amount"),
@@ -31,28 +52,125 @@ def serialize_job(job) -> dict:
         "overview": job.get("overview"),
         "responsibilities": job.get("responsibilities"),
         "skills_required": job.get("skills_required"),
+        "application_count": job.get("application_count", 0),
+        "updated_at": job.get("updated_at", job["created_at"]),
+        "revision": job.get("revision", 0),
     }
 
-async def create_job(data: dict, user_id: str):
+def build_job_document(data: dict, user_id: str) -> dict:
     job = job_model.JobCreate(**data)
     job_data = job.model_dump(exclude_unset=True)
+    if job_data.get("location"):
+        job_data["location"] = to_point(job_data["location"])
+    now = datetime.utcnow()
     job_data.update({
         "_id": ObjectId(),
         "created_by": user_id,
-        "created_at": datetime.utcnow(),
-        "status": "active"  # Ensure default status is set
+        "created_at": now,
+        "updated_at": now,
+        "revision": 1,
+        "status": "active",  # Ensure default status is set
+        "application_count": 0
     })
+    return job_data
+
+async def create_job(data: dict, user_id: str):
+    job_data = build_job_document(data, user_id)
     await jobs.insert_one(job_data)
+    mark_jobs_changed()
     return serialize_job(job_data)
 
-async def update_job(job_id: str, data: dict):
+async def create_jobs(documents: list):
+    """Insert prepared job documents in one round-trip; returns the failed indexes."""
+    failed = {}
+    try:
+        await jobs.insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        failed = {error["index"]: error["errmsg"] for error in e.details.get("writeErrors", [])}
+    mark_jobs_changed()
+    return failed
+
+async def set_jobs_status(job_ids: list, status: str):
+    object_ids = [ObjectId(job_id) for job_id in job_ids]
+    current = {
+        str(job["_id"]): job["status"]
+        async for job in jobs.find({"_id": {"$in": object_ids}}, {"status": 1})
+    }
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne(
+            {"_id": ObjectId(job_id), "status": {"$ne": status}},
+            {"$set": {"status": status, "updated_at": now}, "$inc": {"revision": 1}}
+        )
+        for job_id in current if current[job_id] != status
+    ]
+    if operations:
+        await jobs.bulk_write(operations, ordered=False)
+        for job_id in current:
+            if current[job_id] != status:
+                invalidate_job(job_id)
+    return current
+
+def mark_jobs_changed():
+    global jobs_generation
+    jobs_generation += 1
+
+def invalidate_job(job_id: str):
+    mark_jobs_changed()
+    job_cache.invalidate(str(job_id))
+    job_loads.forget(str(job_id))
+    identity_map.forget("jobs", job_id)
+
+def job_cache_stats() -> dict:
+    return {**job_cache.stats(), "coalesced_loads": job_loads.coalesced}
+
+def _owned_without_applications(job_id: str, owner_id: str = None) -> dict:
+    query = {"_id": ObjectId(job_id)}
+    if owner_id is not None:
+        # Checked in the write itself so an application landing in between
+        # (possibly on another worker) cannot slip past the guard
+        query.update({"created_by": owner_id, "application_count": 0})
+    return query
+
+async def backfill_application_count(job_id: str) -> bool:
+    """Count applications for a job stored before application_count existed.
+
+    Returns True when the field was missing and has now been written.
+    """
+    count = await job_applications.count_documents({"job_id": str(job_id)})
+    result = await jobs.update_one(
+        {"_id": ObjectId(job_id), "application_count": {"$exists": False}},
+        # A new revision so clients holding the count-less ETag refetch
+        {"$set": {"application_count": count, "updated_at": datetime.utcnow()}, "$inc": {"revision": 1}}
+    )
+    if result.modified_count == 1:
+        invalidate_job(job_id)
+    return result.modified_count == 1
+
+async def update_job(job_id: str, data: dict, owner_id: str = None):
     update_model = job_model.JobUpdate(**data)
     update_dict = update_model.model_dump(exclude_unset=True)
-    await jobs.update_one({"_id": ObjectId(job_id)}, {"$set": update_dict})
-    updated = await jobs.find_one({"_id": ObjectId(job_id)})
-    return serialize_job(updated) if updated else None
+    if update_dict.get("location"):
+        update_dict["location"] = to_point(update_dict["location"])
+
+    async def write():
+        return await jobs.find_one_and_update(
+            _owned_without_applications(job_id, owner_id),
+            {"$set": {**update_dict, "updated_at": datetime.utcnow()}, "$inc": {"revision": 1}},
+            return_document=ReturnDocument.AFTER
+        )
 
-async def get_all_jobs(user_id: str = None):
+    updated = await write()
+    if updated is None and owner_id is not None and await backfill_application_count(job_id):
+        updated = await write()
+    invalidate_job(job_id)
+    if not updated:
+        return None
+    updated = serialize_job(updated)
+    identity_map.remember("jobs", job_id, updated)
+    return dict(updated)
+
+async def get_all_jobs(user_id: str = None, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
     query = {"status": "active"}  # Only show active jobs by default
     if user_id:
         # Show all jobs (including blocked) to job owner
@@ -60,10 +178,121 @@ async def get_all_jobs(user_id: str = None):
             {"status": "active"},
             {"created_by": user_id}
         ]}
-    return [serialize_job(job) async for job in jobs.find(query)]
+    page, next_cursor = await fetch_page(jobs, query, LISTING_SORT, limit, cursor)
+    return {"jobs": [serialize_job(job) for job in page], "next_cursor": next_cursor}
 
-async def get_job_by_id(job_id: str, user_id: str = None, admin_check: bool = False):
+async def search_jobs(text: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+    pipeline = [
+        {"$match": {"$text": {"$search": text}, "status": "active"}},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+    ]
+    if cursor:
+        pipeline.append({"$match": cursor_filter(SEARCH_SORT, cursor)})
+    pipeline += [{"$sort": dict(SEARCH_SORT)}, {"$limit": limit + 1}]
+    docs = await jobs.aggregate(pipeline).to_list(limit + 1)
+    page, next_cursor = split_page(docs, SEARCH_SORT, limit)
+    return {
+        "jobs": [{**serialize_job(job), "score": job["score"]} for job in page],
+        "next_cursor": next_cursor
+    }
+
+async def filter_jobs(filters: dict, min_amount: float = None, max_amount: float = None,
+                      limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+    selected = {k: v for k, v in filters.items() if v is not None}
+    # Facet selections are applied per branch below; everything else is shared
+    match = {"status": "active", **{k: v for k, v in selected.items() if k not in FACET_FIELDS}}
+    amount_range = {}
+    if min_amount is not None:
+        amount_range["$gte"] = min_amount
+    if max_amount is not None:
+        amount_range["$lte"] = max_amount
+    if amount_range:
+        match["amount"] = amount_range
+
+    def facet_match(exclude: str = None) -> list:
+        conditions = {k: v for k, v in selected.items() if k in FACET_FIELDS and k != exclude}
+        return [{"$match": conditions}] if conditions else []
+
+    # Stages inside $facet cannot use indexes, so the page is its own query
+    # with the full selection; the aggregation only produces counts.
+    page_query = {**match, **{k: v for k, v in selected.items() if k in FACET_FIELDS}}
+    facets = {"total": facet_match() + [{"$count": "count"}]}
+    for field in FACET_FIELDS:
+        # Each facet ignores its own selection so the other options keep their counts
+        facets[field] = facet_match(exclude=field) + [
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}}
+        ]
+
+    (page, next_cursor), counts = await asyncio.gather(
+        fetch_page(jobs, page_query, LISTING_SORT, limit, cursor),
+        jobs.aggregate([{"$match": match}, {"$facet": facets}]).to_list(1)
+    )
+    result = counts[0]
+    return {
+        "jobs": [serialize_job(job) for job in page],
+        "next_cursor": next_cursor,
+        "total": result["total"][0]["count"] if result["total"] else 0,
+        "facets": {
+            field: {bucket["_id"]: bucket["count"] for bucket in result[field] if bucket["_id"] is not None}
+            for field in FACET_FIELDS
+        }
+    }
+
+async def iter_all_jobs():
+    cursor = jobs.find({"status": "active"}).sort(LISTING_SORT).batch_size(EXPORT_BATCH_SIZE)
+    async for job in cursor:
+        yield serialize_job(job)
+
+async def migrate_legacy_location(job: dict):
+    # Jobs created before locations were stored as GeoJSON are converted the
+    # first time they are read, so they become visible to $geoNear.
+    if is_legacy_location(job.get("location")):
+        job["location"] = to_point(job["location"])
+        await jobs.update_one(
+            {"_id": job["_id"], "location.lat": {"$exists": True}},
+            {"$set": {"location": job["location"]}}
+        )
+
+async def get_nearby_jobs(lat: float, lng: float, radius_km: float,
+                          workplace_type: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    query = {"status": "active"}
+    if workplace_type:
+        query["workplace_type"] = workplace_type
+    pipeline = [
+        {"$geoNear": {
+            "near": to_point({"lat": lat, "lng": lng}),
+            "key": "location",
+            "distanceField": "distance_m",
+            "maxDistance": radius_km * 1000,
+            "query": query,
+            "spherical": True
+        }},
+        {"$limit": limit}
+    ]
+    return [
+        {**serialize_job(job), "distance_km": job["distance_m"] / 1000}
+        async for job in jobs.aggregate(pipeline)
+    ]
+
+async def _load_job(job_id: str):
+    generation = job_cache.generation
     job = await jobs.find_one({"_id": ObjectId(job_id)})
+    if not job:
+        return None
+    await migrate_legacy_location(job)
+    job = serialize_job(job)
+    job_cache.set(job_id, job, generation)
+    return job
+
+async def _get_job(job_id: str):
+    job = job_cache.get(job_id)
+    if job is None:
+        job = await job_loads.do(job_id, lambda: _load_job(job_id))
+    return job
+
+async def get_job_by_id(job_id: str, user_id: str = None, admin_check: bool = False):
+    job = await identity_map.load("jobs", job_id, lambda: _get_job(job_id))
     if job:
         # Skip status check if admin is performing unblock operation
         if not admin_check and job["status"] == "blocked":
@@ -71,14 +300,27 @@ async def get_job_by_id(job_id: str, user_id: str = None, admin_check: bool = Fa
                 return None
             if user_id != job["created_by"] and not await is_admin(user_id):
                 return None
-        job = serialize_job(job)
-        job['application_count'] = await job_seeker_service.get_application_count(job_id)
-        return job
+        return dict(job)
     return None
 
+async def increment_application_count(job_id: str, delta: int):
+    # The count is part of the job representation, so it moves the validators too
+    result = await jobs.update_one(
+        {"_id": ObjectId(job_id), "application_count": {"$exists": True}},
+        {"$inc": {"application_count": delta, "revision": 1}, "$set": {"updated_at": datetime.utcnow()}}
+    )
+    if result.matched_count == 0:
+        # $inc on a missing field would start older jobs from zero; count instead
+        await backfill_application_count(job_id)
+    invalidate_job(job_id)
+
 async def get_jobs_by_user(user_id: str):
     return [serialize_job(job) async for job in jobs.find({"created_by": user_id})]
 
-async def delete_job(job_id: str):
-    result = await jobs.delete_one({"_id": ObjectId(job_id)})
+async def delete_job(job_id: str, owner_id: str = None):
+    query = _owned_without_applications(job_id, owner_id)
+    result = await jobs.delete_one(query)
+    if result.deleted_count == 0 and owner_id is not None and await backfill_application_count(job_id):
+        result = await jobs.delete_one(query)
+    invalidate_job(job_id)
     return {"deleted": result.deleted_count == 1}
@@ -0,0 +1,41 @@
+from app.config.db_config import database
+from datetime import datetime
+import hashlib
+import os
+
+otp_collection = database.get_collection("password_reset_otps")
+# Wrong guesses allowed before the code is thrown away and a new one is needed
+OTP_MAX_ATTEMPTS = int(os.getenv("OTP_MAX_ATTEMPTS", "5"))
+
+def _digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+async def store_otp(email: str, otp: str, expires_at: datetime):
+    await otp_collection.replace_one(
+        {"_id": email},
+        {"otp": otp, "expires_at": expires_at, "verified": False, "attempts": 0,
+         "created_at": datetime.utcnow()},
+        upsert=True
+    )
+
+async def verify_otp(email: str, otp: str, reset_token: str) -> bool:
+    """Mark the code verified and bind ``reset_token`` to it; count a miss otherwise."""
+    verified = await otp_collection.find_one_and_update(
+        {"_id": email, "otp": otp, "verified": False, "expires_at": {"$gt": datetime.utcnow()}},
+        {"$set": {"verified": True, "reset_token": _digest(reset_token)}}
+    )
+    if verified:
+        return True
+    await otp_collection.update_one({"_id": email, "verified": False}, {"$inc": {"attempts": 1}})
+    await otp_collection.delete_one({"_id": email, "attempts": {"$gte": OTP_MAX_ATTEMPTS}})
+    return False
+
+async def consume_reset_token(email: str, reset_token: str) -> bool:
+    # Deleted in the same operation so a token can reset the password only once
+    consumed = await otp_collection.find_one_and_delete({
+        "_id": email,
+        "verified": True,
+        "reset_token": _digest(reset_token),
+        "expires_at": {"$gt": datetime.utcnow()}
+    })
+    return consumed is not None
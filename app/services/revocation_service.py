@@ -0,0 +1,53 @@
+from app.config.db_config import database
+from datetime import datetime
+import asyncio
+import time
+import os
+
+revocations = database.get_collection("token_revocations")
+REVOCATION_REFRESH_SECONDS = float(os.getenv("REVOCATION_REFRESH_SECONDS", "30"))
+
+# user_id -> lowest token_version still accepted; None revokes every token
+_revoked_versions = {}
+_last_refresh = 0.0
+_refresh_lock = asyncio.Lock()
+
+async def refresh_if_stale():
+    global _last_refresh
+    if time.monotonic() - _last_refresh < REVOCATION_REFRESH_SECONDS:
+        return
+    async with _refresh_lock:
+        if time.monotonic() - _last_refresh < REVOCATION_REFRESH_SECONDS:
+            return
+        loaded = {}
+        async for doc in revocations.find({}, {"token_version": 1}):
+            loaded[doc["_id"]] = doc.get("token_version")
+        _revoked_versions.clear()
+        _revoked_versions.update(loaded)
+        _last_refresh = time.monotonic()
+
+def is_revoked(user_id: str, token_version: int) -> bool:
+    if user_id not in _revoked_versions:
+        return False
+    min_version = _revoked_versions[user_id]
+    return min_version is None or token_version < min_version
+
+async def revoke_before(user_id: str, token_version: int):
+    user_id = str(user_id)
+    await revocations.update_one(
+        {"_id": user_id},
+        {"$max": {"token_version": token_version}, "$set": {"revoked_at": datetime.utcnow()}},
+        upsert=True
+    )
+    current = _revoked_versions.get(user_id, 0)
+    if current is not None:
+        _revoked_versions[user_id] = max(current, token_version)
+
+async def revoke_all(user_id: str):
+    user_id = str(user_id)
+    await revocations.update_one(
+        {"_id": user_id},
+        {"$set": {"token_version": None, "revoked_at": datetime.utcnow()}},
+        upsert=True
+    )
+    _revoked_versions[user_id] = None
@@ -1,23 +1,58 @@
 from app.config.db_config import database
 from app.models.user_model import user_helper
-from passlib.context import CryptContext
+from app.services import revocation_service
+from app.utils.cache import TTLCache
+from app.utils import identity_map
+from app.utils.password_util import hash_password
+from app.utils.streaming import EXPORT_BATCH_SIZE
 from bson import ObjectId
+from pymongo import ReturnDocument
+from datetime import datetime
+import os
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 user_collection = database.get_collection("users")
 
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+user_cache = TTLCache(max_size=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
 async def get_user_by_email(email: str):
     user = await user_collection.find_one({"email": email})
     return user_helper(user) if user else None
 
+async def get_cached_user(user_id: str, email: str):
+    # Keyed by the token subject; the email check keeps tokens issued before an
+    # email change from resolving to the renamed account.
+    user = user_cache.get(user_id)
+    if user is not None and user.get("email") == email:
+        return user
+    generation = user_cache.generation
+    user = await get_user_by_email(email)
+    if user and user["_id"] == user_id:
+        user_cache.set(user_id, user, generation)
+    return user
+
+def invalidate_cached_user(user_id: str):
+    user_cache.invalidate(str(user_id))
+    identity_map.forget("users", user_id)
+
 async def get_user_by_id(user_id: str):
-    return await user_collection.find_one({"_id": ObjectId(user_id)})
+    async def fetch():
+        user = await user_collection.find_one({"_id": ObjectId(user_id)})
+        return user_helper(user) if user else None
+    user = await identity_map.load("users", user_id, fetch)
+    # The map may hold the object shared with user_cache; never hand it out
+    return dict(user) if user else None
 
 async def get_all_users():
     return [user_helper(user) async for user in user_collection.find()]
 
+async def iter_all_users():
+    async for user in user_collection.find().batch_size(EXPORT_BATCH_SIZE):
+        yield user_helper(user)
+
 async def create_user(first_name: str, last_name: str, email: str, password: str, **kwargs):
-    hashed_pw = pwd_context.hash(password)
+    hashed_pw = await hash_password(password)
     user = {
         "first_name": first_name,
         "last_name": last_name,
@@ -25,40 +60,45 @@ async def create_user(first_name: str, last_name: str, email: str, password: str
         "password": hashed_pw,
         "role": kwargs.get("role", "user"),
         "active": kwargs.get("active", True),
+        "token_version": 0,
+        "revision": 1,
+        "updated_at": datetime.utcnow(),
         **kwargs
     }
     result = await user_collection.insert_one(user)
     user["_id"] = result.inserted_id
     return user_helper(user)
 
-async def deactivate_user(user_id: str):
-    await user_collection.update_one(
+async def _apply_update(user_id: str, changes: dict, revoke_sessions: bool = False):
+    # Every write moves updated_at/revision forward so HTTP validators change
+    inc = {"revision": 1}
+    if revoke_sessions:
+        # Every change that must end existing sessions goes through a version bump
+        inc["token_version"] = 1
+    updated = await user_collection.find_one_and_update(
         {"_id": ObjectId(user_id)},
-        {"$set": {"active": False}}
+        {"$set": {**changes, "updated_at": datetime.utcnow()}, "$inc": inc},
+        return_document=ReturnDocument.AFTER
     )
+    invalidate_cached_user(user_id)
+    if updated and revoke_sessions:
+        await revocation_service.revoke_before(user_id, updated["token_version"])
+    return updated
+
+async def deactivate_user(user_id: str):
+    await _apply_update(user_id, {"active": False}, revoke_sessions=True)
     return {"message": "User deactivated successfully"}
 
 async def update_user(user_id: str, update_data: dict):
     update_data.pop("_id", None)
-    await user_collection.update_one(
-        {"_id": ObjectId(user_id)},
-        {"$set": update_data}
-    )
-    updated_user = await user_collection.find_one({"_id": ObjectId(user_id)})
+    updated_user = await _apply_update(user_id, update_data, revoke_sessions="password" in update_data)
     return user_helper(updated_user) if updated_user else None
 
 async def delete_user(user_id: str):
     await user_collection.delete_one({"_id": ObjectId(user_id)})
+    invalidate_cached_user(user_id)
+    await revocation_service.revoke_all(user_id)
     return {"message": "User deleted successfully"}
 async def block_user(user_id: str):
-    await user_collection.update_one(
-        {"_id": ObjectId(user_id)},
-        {"$set": {"is_blocked": True}}
-    )
+    await _apply_update(user_id, {"is_blocked": True}, revoke_sessions=True)
     return {"message": "User blocked successfully"}
-
-async def get_user_by_otp(otp: str):
-    return await user_collection.find_one({"otp": otp})
-
-async def get_user_by_otp_verified():
-    return await user_collection.find_one({"otp_verified": True})
@@ -0,0 +1,82 @@
+from collections import OrderedDict
+import asyncio
+import time
+
+
+class TTLCache:
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # Bumped by every invalidation so loads that started before a write
+        # can tell their result is stale and skip caching it.
+        self.generation = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at = entry
+        if time.monotonic() > expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, generation: int = None):
+        if generation is not None and generation != self.generation:
+            return
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        self.generation += 1
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class SingleFlight:
+    """Coalesce concurrent loads of the same key into one awaitable."""
+
+    def __init__(self):
+        self.coalesced = 0
+        self._in_flight = {}
+
+    async def do(self, key, loader):
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(loader())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget_task(key, done))
+        else:
+            self.coalesced += 1
+        # Shielded so one cancelled caller does not cancel the shared load
+        return await asyncio.shield(task)
+
+    def forget(self, key):
+        self._in_flight.pop(key, None)
+
+    def _forget_task(self, key, task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
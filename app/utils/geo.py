@@ -0,0 +1,12 @@
+def to_point(location: dict) -> dict:
+    # GeoJSON orders coordinates longitude first
+    return {"type": "Point", "coordinates": [location["lng"], location["lat"]]}
+
+def from_point(location: dict):
+    if not location or "coordinates" not in location:
+        return location
+    lng, lat = location["coordinates"]
+    return {"lat": lat, "lng": lng}
+
+def is_legacy_location(location) -> bool:
+    return isinstance(location, dict) and "lat" in location and "lng" in location
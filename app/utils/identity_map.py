@@ -0,0 +1,47 @@
+from contextvars import ContextVar
+
+
+class IdentityMap:
+    """Documents read during one request, keyed by (collection, _id)."""
+
+    def __init__(self):
+        self.loads = 0
+        self.saved = 0
+        self._documents = {}
+
+
+_current: ContextVar = ContextVar("identity_map", default=None)
+
+def begin():
+    return _current.set(IdentityMap())
+
+def end(token):
+    _current.reset(token)
+
+def current():
+    return _current.get()
+
+async def load(collection: str, doc_id, loader):
+    identity_map = _current.get()
+    if identity_map is None:
+        return await loader()
+    key = (collection, str(doc_id))
+    if key in identity_map._documents:
+        identity_map.saved += 1
+        return identity_map._documents[key]
+    document = await loader()
+    identity_map.loads += 1
+    # Misses are not remembered; the document may be created later in the request
+    if document is not None:
+        identity_map._documents[key] = document
+    return document
+
+def remember(collection: str, doc_id, document):
+    identity_map = _current.get()
+    if identity_map is not None:
+        identity_map._documents[(collection, str(doc_id))] = document
+
+def forget(collection: str, doc_id):
+    identity_map = _current.get()
+    if identity_map is not None:
+        identity_map._documents.pop((collection, str(doc_id)), None)
@@ -1,18 +1,33 @@
 import jwt
+from contextvars import ContextVar
 from datetime import datetime, timedelta
 import os
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
+# When enabled, tokens carry role/active/is_blocked and a token version so
+# requests can be authorized without loading the user document.
+STATELESS_AUTH = os.getenv("STATELESS_AUTH", "false").lower() == "true"
 
-def create_jwt_token(user_id: str, email: str):
+request_claims: ContextVar = ContextVar("request_claims", default=None)
+
+def user_claims(user: dict) -> dict:
+    return {
+        "role": user.get("role", "user"),
+        "active": user.get("active", True),
+        "is_blocked": user.get("is_blocked", False),
+        "ver": user.get("token_version", 0),
+    }
+
+def create_jwt_token(user_id: str, email: str, claims: dict = None):
     expires = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode = {
         "sub": str(user_id),
         "email": email,
         "exp": expires,
         "iat": datetime.utcnow(),
+        **(claims or {}),
     }
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
@@ -0,0 +1,63 @@
+from bson import json_util, ObjectId
+from datetime import datetime
+from fastapi import HTTPException, status
+from pymongo import ASCENDING
+import base64
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+def encode_cursor(values: list) -> str:
+    # Extended JSON keeps datetimes and ObjectIds round-trippable
+    return base64.urlsafe_b64encode(json_util.dumps(values).encode()).decode()
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        return json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def _after(direction, value, nullable: bool):
+    if not nullable:
+        return {"$gt" if direction == ASCENDING else "$lt": value}
+    # Mongo sorts null (and missing) before every number
+    if direction == ASCENDING:
+        return {"$ne": None} if value is None else {"$gt": value}
+    return None if value is None else {"$not": {"$gte": value}}
+
+def keyset_filter(sort: list, values: list, nullable: tuple = ()) -> dict:
+    """Match documents strictly after ``values`` in ``sort`` order."""
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        after = _after(direction, values[i], field in nullable)
+        if after is None:
+            continue
+        clause = {f: v for (f, _), v in zip(sort[:i], values[:i])}
+        clause[field] = after
+        clauses.append(clause)
+    return {"$or": clauses}
+
+# Sort keys are only ever these types; anything else (notably a dict, which
+# Mongo would read as an operator) did not come from encode_cursor
+CURSOR_VALUE_TYPES = (datetime, ObjectId, int, float, str, type(None))
+
+def cursor_filter(sort: list, cursor: str, nullable: tuple = ()) -> dict:
+    values = decode_cursor(cursor)
+    if (not isinstance(values, list) or len(values) != len(sort)
+            or not all(isinstance(value, CURSOR_VALUE_TYPES) for value in values)):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return keyset_filter(sort, values, nullable)
+
+def split_page(docs: list, sort: list, limit: int):
+    # Callers fetch limit + 1 documents; the extra one means another page exists
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    return docs, encode_cursor([docs[-1].get(field) for field, _ in sort])
+
+async def fetch_page(collection, query: dict, sort: list, limit: int, cursor: str = None,
+                     projection: dict = None, nullable: tuple = ()):
+    if cursor:
+        query = {"$and": [query, cursor_filter(sort, cursor, nullable)]}
+    docs = await collection.find(query, projection).sort(sort).limit(limit + 1).to_list(limit + 1)
+    return split_page(docs, sort, limit)
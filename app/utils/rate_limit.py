@@ -0,0 +1,58 @@
+from collections import OrderedDict
+from fastapi import Request
+import time
+import os
+
+# Set when behind a proxy, e.g. X-Forwarded-For; otherwise every client would
+# share the proxy's address. Only trust a header the proxy overwrites or appends.
+CLIENT_IP_HEADER = os.getenv("CLIENT_IP_HEADER")
+# Proxies in front of the app; the client is this many entries from the right
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "1"))
+
+def client_ip(request: Request):
+    if CLIENT_IP_HEADER:
+        forwarded = [ip.strip() for ip in request.headers.get(CLIENT_IP_HEADER, "").split(",") if ip.strip()]
+        if forwarded:
+            return forwarded[-min(TRUSTED_PROXY_HOPS, len(forwarded))]
+    return request.client.host if request.client else None
+
+
+class TokenBucketLimiter:
+    def __init__(self, capacity: int, window_seconds: float, max_keys: int = 100000):
+        self.capacity = capacity
+        self.refill_rate = capacity / window_seconds
+        self.max_keys = max_keys
+        self.allowed = 0
+        self.throttled = 0
+        self._buckets = OrderedDict()
+
+    def allow(self, key: str, consume: bool = True) -> bool:
+        # consume=False only checks, so callers with several buckets can make
+        # sure all of them have a token before taking one from any
+        now = time.monotonic()
+        tokens, last = self._buckets.pop(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - last) * self.refill_rate)
+        allowed = tokens >= 1
+        if not allowed:
+            self.throttled += 1
+        elif consume:
+            tokens -= 1
+            self.allowed += 1
+        # Re-inserting keeps the most recently seen keys at the end, so the
+        # oldest (and therefore fullest) buckets are the ones evicted.
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed
+
+    def retry_after(self) -> int:
+        return max(1, int(1 / self.refill_rate))
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "tracked_keys": len(self._buckets),
+            "max_keys": self.max_keys,
+            "allowed": self.allowed,
+            "throttled": self.throttled,
+        }
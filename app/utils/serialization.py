@@ -0,0 +1,23 @@
+from bson import ObjectId, Decimal128
+from fastapi.responses import JSONResponse
+import orjson
+
+def _default(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal128):
+        return float(obj.to_decimal())
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def dumps(content) -> bytes:
+    """Encode Mongo documents straight to JSON bytes; datetimes become ISO 8601."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class BSONJSONResponse(JSONResponse):
+    # Returning this from a route skips FastAPI's jsonable_encoder pass, so
+    # raw documents are encoded exactly once.
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,19 @@
+from fastapi.responses import StreamingResponse
+from app.utils.serialization import dumps
+import os
+
+# Documents pulled per cursor round-trip and written per chunk
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+def ndjson_response(documents) -> StreamingResponse:
+    """Stream an async iterable of documents as newline-delimited JSON."""
+    async def chunks():
+        lines = []
+        async for doc in documents:
+            lines.append(dumps(doc))
+            if len(lines) >= EXPORT_BATCH_SIZE:
+                yield b"\n".join(lines) + b"\n"
+                lines = []
+        if lines:
+            yield b"\n".join(lines) + b"\n"
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
@@ -1,5 +1,9 @@
 from app.services import user_service
+from app.utils.jwt_util import request_claims
 
 async def is_admin(user_id: str) -> bool:
+    claims = request_claims.get()
+    if claims and claims.get("sub") == str(user_id):
+        return claims.get("role") == "admin"
     user = await user_service.get_user_by_id(user_id)
     return user and user.get("role") == "admin"
@@ -13,6 +13,12 @@ class UserLogin(BaseModel):
 class ForgotPasswordRequest(BaseModel):
     email: EmailStr
 
+class VerifyOtpRequest(BaseModel):
+    email: EmailStr
+    otp: str
+
 class ResetPasswordRequest(BaseModel):
+    email: EmailStr
+    reset_token: str = Field(..., min_length=1, description="Token returned by verify-otp")
     new_password: str = Field(..., min_length=6, description="Password must be at least 6 characters")
     confirm_password: str = Field(..., min_length=6, description="Confirm password must match new password")
@@ -21,16 +21,23 @@ required_fields = {
     'rate_type': {'options': ['hourly', 'daily', 'weekly', 'monthly']}
 }
 
+def validate_location(loc) -> None:
+    if not isinstance(loc, dict) or \
+       not all(k in loc for k in ['lat', 'lng']) or \
+       not all(isinstance(v, (int, float)) for v in loc.values()):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Location must be {'lat': number, 'lng': number}"
+        )
+    if not -90 <= loc['lat'] <= 90 or not -180 <= loc['lng'] <= 180:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Location lat must be within [-90, 90] and lng within [-180, 180]"
+        )
+
 def validate_job_data(job_data: dict) -> None:
-    if 'location' in job_data:
-        loc = job_data['location']
-        if not isinstance(loc, dict) or \
-           not all(k in loc for k in ['lat', 'lng']) or \
-           not all(isinstance(v, (int, float)) for v in loc.values()):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Location must be {'lat': number, 'lng': number}"
-            )
+    if job_data.get('location') is not None:
+        validate_location(job_data['location'])
             
     for field, rules in required_fields.items():
         if field not in job_data:
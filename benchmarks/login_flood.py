@@ -0,0 +1,78 @@
+"""Measure /jobs/all latency while /auth/login is flooded with bad passwords.
+
+Run against a live server (uvicorn main:app) with httpx installed:
+
+    LOGIN_MAX_ATTEMPTS_PER_IP=1000000 LOGIN_MAX_ATTEMPTS_PER_EMAIL=1000000 uvicorn main:app
+    python benchmarks/login_flood.py --email me@example.com --password secret
+
+Raise the login limits for the run as shown; otherwise the throttle answers
+most of the flood with 429 before bcrypt runs and the numbers say nothing
+about hashing. The flood must use a real account so every attempt is hashed.
+
+Latency percentiles are printed for a quiet baseline and for the flood. With
+hashing on the event loop the flood percentiles climb with every concurrent
+login; with the hashing executor they should stay close to the baseline.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def probe(client: httpx.AsyncClient, token: str, samples: int) -> list:
+    latencies = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        await client.get("/jobs/all", headers={"Authorization": f"Bearer {token}"})
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.05)
+    return latencies
+
+
+async def flood(client: httpx.AsyncClient, email: str, stop: asyncio.Event, statuses: dict):
+    while not stop.is_set():
+        response = await client.post("/auth/login", json={"email": email, "password": "wrong-password"})
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+def report(label: str, latencies: list):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:>8}: p50={statistics.median(latencies):7.1f}ms  p95={p95:7.1f}ms  max={latencies[-1]:7.1f}ms")
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        login = await client.post("/auth/login", json={"email": args.email, "password": args.password})
+        login.raise_for_status()
+        token = login.json()["access_token"]
+
+        report("baseline", await probe(client, token, args.samples))
+
+        stop = asyncio.Event()
+        statuses = {}
+        attackers = [
+            asyncio.create_task(flood(client, args.email, stop, statuses)) for _ in range(args.concurrency)
+        ]
+        try:
+            report("flood", await probe(client, token, args.samples))
+        finally:
+            stop.set()
+            await asyncio.gather(*attackers, return_exceptions=True)
+
+        print(f"   flood: {sum(statuses.values())} logins, status counts {dict(sorted(statuses.items()))}")
+        if statuses.get(429, 0) > sum(statuses.values()) / 2:
+            print("warning: most logins were throttled; raise LOGIN_MAX_ATTEMPTS_* on the server")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--samples", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,76 @@
+"""Per-document cost of response serialization, before and after orjson.
+
+    python benchmarks/serialization.py [--docs 1000] [--rounds 50]
+
+"before" replays the old job-seeker route path: serialize_doc copied the
+dict in the service, the route copied it again, then jsonable_encoder
+walked it and the stdlib json encoder rendered it. "after" is the single
+BSON-aware orjson pass used by BSONJSONResponse.
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import timeit
+from datetime import datetime
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.utils.serialization import dumps  # noqa: E402
+
+
+def make_documents(count: int) -> list:
+    return [{
+        "_id": ObjectId(),
+        "job_id": str(ObjectId()),
+        "user_id": str(ObjectId()),
+        "cover_letter": "I have shipped several FastAPI services backed by MongoDB. " * 8,
+        "proposed_amount": 1250.0,
+        "status": "pending",
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    } for _ in range(count)]
+
+
+def legacy_serialize_doc(doc):
+    doc = doc.copy()
+    doc["id"] = str(doc.pop("_id", doc.get("id", "")))
+    if isinstance(doc.get("created_by"), ObjectId):
+        doc["created_by"] = str(doc["created_by"])
+    return doc
+
+
+def before(documents):
+    page = [legacy_serialize_doc(doc) for doc in documents]
+    page = [legacy_serialize_doc(doc) for doc in page]
+    return json.dumps(jsonable_encoder(page)).encode()
+
+
+def after(documents):
+    for doc in documents:
+        doc["id"] = str(doc.pop("_id"))
+    return dumps(documents)
+
+
+def measure(func, documents, rounds: int) -> float:
+    # Each round gets fresh documents because the new path renames in place
+    batches = [copy.deepcopy(documents) for _ in range(rounds)]
+    batch_iter = iter(batches)
+    total = timeit.timeit(lambda: func(next(batch_iter)), number=rounds)
+    return total / (rounds * len(documents)) * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serialization microbenchmark")
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    documents = make_documents(args.docs)
+    old = measure(before, documents, args.rounds)
+    new = measure(after, documents, args.rounds)
+    print(f"before: {old:6.2f} us/doc")
+    print(f"after:  {new:6.2f} us/doc  ({old / new:.1f}x faster)")
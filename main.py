@@ -1,12 +1,30 @@
 from fastapi import FastAPI
 from dotenv import load_dotenv
-from app.routes import user_routes, auth_route, job_routes , job_seeker_routes, admin_routes
+from contextlib import asynccontextmanager
+from app.routes import user_routes, auth_route, job_routes , job_seeker_routes, admin_routes, health_routes
 from app.middleware.auth_middleware import auth_middleware
+from app.middleware.identity_map_middleware import identity_map_middleware
+from app.services import email_service
+from app.config.db_config import database, connect_to_mongo, close_mongo_connection
+from app.config.indexes import ensure_indexes, REQUIRE_INDEXES
+from app.utils.serialization import BSONJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 load_dotenv()
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await connect_to_mongo()
+    failures = await ensure_indexes(database)
+    if failures and REQUIRE_INDEXES:
+        close_mongo_connection()
+        raise RuntimeError(f"Missing indexes: {', '.join(sorted(failures))}")
+    email_service.start_worker()
+    yield
+    await email_service.stop_worker()
+    close_mongo_connection()
+
+app = FastAPI(lifespan=lifespan, default_response_class=BSONJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,12 +35,15 @@ app.add_middleware(
 )
 
 app.middleware("http")(auth_middleware)
+# Registered last so it wraps auth and the user it loads joins the request's map
+app.middleware("http")(identity_map_middleware)
 
 app.include_router(auth_route.router, prefix="/auth", tags=["Authentication"])
 app.include_router(user_routes.router, prefix="/users", tags=["Users"])
 app.include_router(job_routes.router, prefix="/jobs", tags=["Jobs"]) 
 app.include_router(job_seeker_routes.router,prefix="/job-seeker",tags=["Job Seeker"])
 app.include_router(admin_routes.router, prefix="/admin", tags=["admin"])
+app.include_router(health_routes.router, prefix="/health", tags=["Health"])
 
 
 @app.get("/")